@@ -14,7 +14,12 @@
  * 
  * Communication Protocol:
  * From RPi: "PHASE:n", "DISPLAY:text", "MIRROR:text", "CLEAR", "TEST"
+ * From RPi (binary): 0x00, COBS(opcode, uint8 fields...), 0x00
+ *   0x01 SET_CELL cell,pattern
  * To RPi: "READY", "PHASE_SET:n", "DISPLAYED:text", "ERROR:msg"
+ * To RPi (binary slate events): 0x00, COBS(opcode, uint8 fields...), 0x00
+ *   0x01 BUTTON_PRESS row,col,cell,dot   0x02 BUTTON_RELEASE row,col,cell,dot
+ *   0x03 DOT_PRESSED cell,dot
  * From/To Slate: "BTN:row,col", "REL:row,col", "LED:row,col,state"
  */
 
@@ -25,6 +30,15 @@
 #define BAUD_RATE 115200
 #define SLATE_BAUD_RATE 115200
 
+// Binary event frame opcodes (see protocol notes above)
+#define FRAME_BUTTON_PRESS 0x01
+#define FRAME_BUTTON_RELEASE 0x02
+#define FRAME_DOT_PRESSED 0x03
+#define FRAME_MAX_PAYLOAD 8
+
+// Binary command frame opcodes from RPi
+#define FRAME_SET_CELL 0x01
+
 // Serial communication with Writing Slate (pins 7,8)
 SoftwareSerial slateSerial(7, 8); // RX, TX
 
@@ -52,9 +66,14 @@ struct SystemState {
 // Input buffers
 String rpiBuffer = "";
 String slateBuffer = "";
-bool rpiStringComplete = false;
 bool slateStringComplete = false;
 
+// Binary frame from RPi being received (COBS-encoded, delimiters stripped)
+uint8_t rpiFrame[FRAME_MAX_PAYLOAD + 1];
+uint8_t rpiFrameLength = 0;
+bool rpiInFrame = false;
+bool rpiSkipLine = false;  // Dropping the rest of a text line after losing frame sync
+
 // Timing
 unsigned long lastHeartbeat = 0;
 const unsigned long HEARTBEAT_INTERVAL = 5000; // 5 seconds
@@ -113,20 +132,86 @@ void initializeSystem() {
 void processRPiCommunication() {
   // Read from RPi
   while (Serial.available()) {
-    char inChar = (char)Serial.read();
-    rpiBuffer += inChar;
+    uint8_t inByte = Serial.read();
+    
+    // A zero byte opens or closes a binary frame; text never contains one
+    if (inByte == 0x00) {
+      if (rpiInFrame && rpiFrameLength > 0) {
+        processRPiFrame(rpiFrame, rpiFrameLength);
+        rpiInFrame = false;
+      } else {
+        // The RPi never sends an empty frame, so a zero straight after
+        // another one opens the next frame rather than closing this one.
+        // Back-to-back frames get back in step after a lost delimiter.
+        rpiInFrame = true;
+        rpiBuffer = "";  // Text lines always end before a frame starts
+        rpiSkipLine = false;
+      }
+      rpiFrameLength = 0;
+      continue;
+    }
+    if (rpiInFrame) {
+      if (rpiFrameLength < sizeof(rpiFrame)) {
+        rpiFrame[rpiFrameLength++] = inByte;
+      } else {
+        // Longer than any frame: this is text read as a frame body after
+        // a lost delimiter. Go back to text mode and drop the broken line.
+        rpiInFrame = false;
+        rpiFrameLength = 0;
+        rpiSkipLine = (inByte != '\n');
+      }
+      continue;
+    }
     
+    char inChar = (char)inByte;
+    if (rpiSkipLine) {
+      rpiSkipLine = (inChar != '\n');
+      continue;
+    }
+    
+    // Batched writes carry several lines, so handle each as it completes
     if (inChar == '\n') {
-      rpiStringComplete = true;
+      rpiBuffer.trim();
+      if (rpiBuffer.length() > 0) {
+        processRPiCommand(rpiBuffer);
+      }
+      rpiBuffer = "";
+    } else {
+      rpiBuffer += inChar;
     }
   }
+}
+
+void processRPiFrame(const uint8_t* encoded, uint8_t length) {
+  // COBS-decode the frame; anything malformed or oversized is dropped
+  uint8_t payload[FRAME_MAX_PAYLOAD];
+  uint8_t n = 0;
+  uint8_t i = 0;
   
-  // Process complete command from RPi
-  if (rpiStringComplete) {
-    rpiBuffer.trim();
-    processRPiCommand(rpiBuffer);
-    rpiBuffer = "";
-    rpiStringComplete = false;
+  while (i < length) {
+    uint8_t code = encoded[i];
+    if (code == 0 || i + code > length) {
+      return;
+    }
+    for (uint8_t j = 1; j < code; j++) {
+      if (n >= FRAME_MAX_PAYLOAD) {
+        return;
+      }
+      payload[n++] = encoded[i + j];
+    }
+    i += code;
+    if (code != 0xFF && i < length) {
+      if (n >= FRAME_MAX_PAYLOAD) {
+        return;
+      }
+      payload[n++] = 0;
+    }
+  }
+  
+  systemState.lastActivity = millis();
+  
+  if (n == 3 && payload[0] == FRAME_SET_CELL) {
+    brailleDisplay.setCellPattern(payload[1], payload[2]);
   }
 }
 
@@ -318,14 +403,8 @@ void handleButtonPress(uint8_t row, uint8_t col) {
   mapButtonToBraille(row, col, &cellIndex, &dotIndex);
   
   // Send position info to RPi for processing
-  Serial.print(F("BUTTON_PRESS:"));
-  Serial.print(row);
-  Serial.print(F(","));
-  Serial.print(col);
-  Serial.print(F(","));
-  Serial.print(cellIndex);
-  Serial.print(F(","));
-  Serial.println(dotIndex);
+  uint8_t frame[] = {FRAME_BUTTON_PRESS, row, col, cellIndex, dotIndex};
+  sendFrame(frame, sizeof(frame));
   
   // Phase-specific handling
   handlePhaseSpecificInput(cellIndex, dotIndex, true);
@@ -335,14 +414,8 @@ void handleButtonRelease(uint8_t row, uint8_t col) {
   uint8_t cellIndex, dotIndex;
   mapButtonToBraille(row, col, &cellIndex, &dotIndex);
   
-  Serial.print(F("BUTTON_RELEASE:"));
-  Serial.print(row);
-  Serial.print(F(","));
-  Serial.print(col);
-  Serial.print(F(","));
-  Serial.print(cellIndex);
-  Serial.print(F(","));
-  Serial.println(dotIndex);
+  uint8_t frame[] = {FRAME_BUTTON_RELEASE, row, col, cellIndex, dotIndex};
+  sendFrame(frame, sizeof(frame));
   
   handlePhaseSpecificInput(cellIndex, dotIndex, false);
 }
@@ -356,10 +429,8 @@ void handlePhaseSpecificInput(uint8_t cellIndex, uint8_t dotIndex, bool pressed)
         brailleDisplay.setCellPattern(cellIndex, pattern);
         
         // Send dot position to RPi
-        Serial.print(F("DOT_PRESSED:"));
-        Serial.print(cellIndex);
-        Serial.print(F(","));
-        Serial.println(dotIndex);
+        uint8_t frame[] = {FRAME_DOT_PRESSED, cellIndex, dotIndex};
+        sendFrame(frame, sizeof(frame));
       }
       break;
       
@@ -382,6 +453,31 @@ void handlePhaseSpecificInput(uint8_t cellIndex, uint8_t dotIndex, bool pressed)
   }
 }
 
+void sendFrame(const uint8_t* payload, uint8_t length) {
+  // COBS-encode the payload so it contains no zero bytes, then wrap it in
+  // zero delimiters. Payloads are far below 254 bytes, so no 0xFF blocks.
+  uint8_t encoded[FRAME_MAX_PAYLOAD + 1];
+  uint8_t codeIndex = 0;
+  uint8_t code = 1;
+  uint8_t out = 1;
+  
+  for (uint8_t i = 0; i < length; i++) {
+    if (payload[i] == 0) {
+      encoded[codeIndex] = code;
+      codeIndex = out++;
+      code = 1;
+    } else {
+      encoded[out++] = payload[i];
+      code++;
+    }
+  }
+  encoded[codeIndex] = code;
+  
+  Serial.write((uint8_t)0x00);
+  Serial.write(encoded, out);
+  Serial.write((uint8_t)0x00);
+}
+
 void mapButtonToBraille(uint8_t row, uint8_t col, uint8_t* cellIndex, uint8_t* dotIndex) {
   // Map 10x10 button matrix to Braille cells
   // Each cell occupies a 2x3 area, allowing for multiple cells
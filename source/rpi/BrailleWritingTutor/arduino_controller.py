@@ -5,12 +5,110 @@ Handles serial communication with Arduino Uno (Braille Display Controller)
 
 import serial
 import serial.tools.list_ports
+import os
+import selectors
 import threading
 import time
 import queue
+import collections
+import contextlib
+import logging
+import struct
 from typing import Optional, Callable
 
 
+log = logging.getLogger("braille.arduino")
+
+
+# Upper bounds for coalescing queued commands into a single serial write
+WRITE_BATCH_MAX_COMMANDS = 64
+WRITE_BATCH_MAX_BYTES = 4096
+
+# Queued after a command sent with sync=True; makes the writer drain the port
+_FLUSH = None
+
+# Arduino sends a heartbeat every 5 seconds; allow a few to be missed
+HEARTBEAT_TIMEOUT = 15.0
+
+# Binary slate events arrive as 0x00, COBS(opcode + uint8 fields), 0x00.
+# Text lines never contain 0x00, so a leading zero marks a frame.
+FRAME_OPCODES = {
+    0x01: (b'BUTTON_PRESS', struct.Struct('<BBBB')),    # row, col, cell, dot
+    0x02: (b'BUTTON_RELEASE', struct.Struct('<BBBB')),  # row, col, cell, dot
+    0x03: (b'DOT_PRESSED', struct.Struct('<BB'))        # cell, dot
+}
+
+# Longest COBS-encoded frame body (opcode + fields, plus one overhead byte)
+FRAME_MAX_ENCODED = 2 + max(layout.size for _, layout in FRAME_OPCODES.values())
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """Encode data with Consistent Overhead Byte Stuffing (no zero bytes)"""
+    out = bytearray(b'\x00')
+    code_index = 0
+    code = 1
+    for b in data:
+        if b:
+            out.append(b)
+            code += 1
+        if not b or code == 0xFF:
+            out[code_index] = code
+            code_index = len(out)
+            out.append(0)
+            code = 1
+    out[code_index] = code
+    return bytes(out)
+
+
+def decode_frame(frame: bytes):
+    """
+    Decode a slate event frame (without delimiters)
+    
+    Returns:
+        (msg_type, fields) tuple, or None if frame is not a valid event
+    """
+    try:
+        payload = cobs_decode(frame)
+    except ValueError:
+        return None
+    if not payload or payload[0] not in FRAME_OPCODES:
+        return None
+    msg_type, layout = FRAME_OPCODES[payload[0]]
+    if len(payload) != 1 + layout.size:
+        return None
+    return msg_type, layout.unpack_from(payload, 1)
+
+
+def cobs_decode(data: bytes) -> bytes:
+    """Decode a COBS-encoded frame (without delimiters)"""
+    out = bytearray()
+    idx = 0
+    n = len(data)
+    while idx < n:
+        code = data[idx]
+        end = idx + code
+        if code == 0 or end > n:
+            raise ValueError(f"invalid COBS frame: {data!r}")
+        out += data[idx + 1:end]
+        idx = end
+        if code != 0xFF and idx < n:
+            out.append(0)
+    return bytes(out)
+
+
+# Binary commands to the Arduino use the same framing:
+#   0x01 SET_CELL cell, pattern (6-bit dot mask)
+FRAME_SET_CELL = 0x01
+NUM_BRAILLE_CELLS = 10
+
+# Every delimited SET_CELL frame, built once so setting a cell only queues bytes
+SET_CELL_FRAMES = tuple(
+    tuple(b'\x00' + cobs_encode(bytes((FRAME_SET_CELL, cell, pattern))) + b'\x00'
+          for pattern in range(64))
+    for cell in range(NUM_BRAILLE_CELLS)
+)
+
+
 class ArduinoController:
     """Manages communication with Arduino Uno Braille Display Controller"""
     
@@ -18,11 +116,14 @@ class ArduinoController:
         self.port = port or self._auto_detect_port()
         self.baud_rate = baud_rate
         self.serial_connection: Optional[serial.Serial] = None
-        self.is_connected = False
+        self._connected = False
         self.running = False
         
         # Message queues
-        self.command_queue = queue.Queue()
+        self.command_deque = collections.deque()  # Single producer/consumer, no lock needed
+        self._cmd_event = threading.Event()       # Wakes the writer when commands arrive
+        self._tx_buf = bytearray(WRITE_BATCH_MAX_BYTES)  # Reused for every batch write
+        self._batching = threading.local()        # Commands held by batch() per thread
         self.response_queue = queue.Queue()
         
         # Threading
@@ -30,6 +131,11 @@ class ArduinoController:
         self.writer_thread: Optional[threading.Thread] = None
         self.thread_lock = threading.Lock()
         
+        # Self-pipe used to wake the reader's selector on shutdown
+        self._shutdown_r: Optional[int] = None
+        self._shutdown_w: Optional[int] = None
+        self._rx_buf = bytearray()  # Partial line carried between reads
+        
         # Callbacks for different message types
         self.callbacks = {
             'READY': None,
@@ -39,9 +145,26 @@ class ArduinoController:
             'BUTTON_RELEASE': None,
             'DOT_PRESSED': None,
             'HEARTBEAT': None,
-            'ERROR': None
+            'ERROR': None,
+            'DISCONNECTED': None
         }
         
+        # Built-in message handlers, keyed by raw message type
+        self._handlers = {
+            b'READY': self._on_ready,
+            b'PHASE_SET': self._on_phase_set,
+            b'DISPLAYED': self._on_displayed,
+            b'MIRRORED': self._on_mirrored,
+            b'BUTTON_PRESS': self._handle_button_press,
+            b'BUTTON_RELEASE': self._handle_button_release,
+            b'DOT_PRESSED': self._handle_dot_press,
+            b'HEARTBEAT': self._on_heartbeat,
+            b'ERROR': self._on_error
+        }
+        
+        # Registered callbacks keyed by raw message type for the reader thread
+        self._raw_callbacks = {}
+        
         # Current system state
         self.current_phase = 0
         self.display_enabled = False
@@ -83,7 +206,7 @@ class ArduinoController:
             self.serial_connection = serial.Serial(
                 port=self.port,
                 baudrate=self.baud_rate,
-                timeout=1,
+                timeout=0.5,  # Lets the reader re-check self.running while idle
                 write_timeout=1
             )
             
@@ -92,7 +215,8 @@ class ArduinoController:
             
             # Check if Arduino is ready
             if self.serial_connection.is_open:
-                self.is_connected = True
+                self._connected = True
+                self.last_heartbeat = time.time()
                 self.running = True
                 
                 # Start communication threads
@@ -115,153 +239,373 @@ class ArduinoController:
         """Disconnect from Arduino"""
         self.running = False
         
+        # Wake both threads immediately instead of waiting for their timeouts
+        if self._shutdown_w is not None:
+            try:
+                os.write(self._shutdown_w, b'\0')
+            except OSError:
+                pass
+        self._cmd_event.set()
+        
         if self.reader_thread and self.reader_thread.is_alive():
             self.reader_thread.join(timeout=2)
         
         if self.writer_thread and self.writer_thread.is_alive():
             self.writer_thread.join(timeout=2)
+        
+        self._close_shutdown_pipe()
             
         if self.serial_connection and self.serial_connection.is_open:
+            try:
+                self.serial_connection.flush()
+            except Exception:
+                pass  # Port already gone (termios raises its own error type)
             self.serial_connection.close()
             
-        self.is_connected = False
+        self._connected = False
         print("Disconnected from Arduino")
     
     def start_threads(self):
         """Start reader and writer threads"""
+        self._close_shutdown_pipe()
+        self._shutdown_r, self._shutdown_w = os.pipe()
+        
         self.reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
         self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
         
         self.reader_thread.start()
         self.writer_thread.start()
     
+    def _close_shutdown_pipe(self):
+        """Close the reader wake-up pipe if one is open"""
+        for fd in (self._shutdown_r, self._shutdown_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._shutdown_r = self._shutdown_w = None
+    
     def _reader_loop(self):
         """Read messages from Arduino"""
-        while self.running and self.is_connected:
+        # Threads are restarted on every connect, so the port and bound methods
+        # can be resolved once instead of on every iteration
+        ser = self.serial_connection
+        self._rx_buf.clear()
+        
+        try:
+            serial_fd = ser.fileno()
+        except (AttributeError, OSError, serial.SerialException):
+            serial_fd = None
+        
+        if serial_fd is None:
+            # Ports without a file descriptor (e.g. pyserial URL handlers)
+            self._reader_loop_blocking(ser)
+            self._on_connection_lost()
+            return
+        
+        # Sleep in epoll until the Arduino sends data or disconnect() wakes us
+        selector = selectors.DefaultSelector()
+        selector.register(serial_fd, selectors.EVENT_READ)
+        selector.register(self._shutdown_r, selectors.EVENT_READ)
+        feed = self._feed
+        
+        try:
+            while self.running and self._connected:
+                for key, _ in selector.select():
+                    if key.fd != serial_fd:
+                        return
+                    data = os.read(serial_fd, 4096)
+                    if not data:
+                        print("Reader error: serial port closed")
+                        return
+                    feed(data)
+                    
+        except Exception as e:
+            print(f"Reader error: {e}")
+        finally:
+            selector.close()
+            self._on_connection_lost()
+    
+    def _on_connection_lost(self):
+        """Report a reader exit that was not requested by disconnect()"""
+        if not (self.running and self._connected):
+            return
+        self._connected = False
+        print("Warning: Arduino connection lost")
+        callback = self.callbacks.get('DISCONNECTED')
+        if callback:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in DISCONNECTED callback: {e}")
+    
+    def _reader_loop_blocking(self, ser):
+        """Read messages in bursts using blocking reads on the port timeout"""
+        read = ser.read
+        feed = self._feed
+        
+        while self.running and self._connected:
             try:
-                if self.serial_connection and self.serial_connection.in_waiting > 0:
-                    line = self.serial_connection.readline().decode('utf-8').strip()
-                    if line:
-                        self._process_message(line)
-                        
-                time.sleep(0.01)  # Small delay to prevent CPU overload
+                # Take everything already buffered; otherwise block for one byte
+                # (or until the port timeout expires)
+                waiting = ser.in_waiting
+                data = read(waiting or 1)
+                if data:
+                    feed(data)
                 
             except Exception as e:
                 print(f"Reader error: {e}")
                 break
     
+    def _feed(self, data: bytes):
+        """
+        Append received bytes and process every complete line or frame
+        
+        A lost or extra delimiter only costs the damaged item, as on the
+        Arduino: frames are never empty, so a zero straight after another one
+        opens the next frame; a "frame" that does not decode was a stray zero
+        in front of text; and a text line never runs across a zero byte.
+        """
+        buf = self._rx_buf
+        buf += data
+        start = 0
+        size = len(buf)
+        while start < size:
+            if buf[start] == 0:
+                # Binary frame: runs to the next zero delimiter
+                end = buf.find(b'\x00', start + 1, start + FRAME_MAX_ENCODED + 2)
+                if end < 0:
+                    if size - start <= FRAME_MAX_ENCODED + 1:
+                        break  # Rest of the frame not received yet
+                    start += 1  # Longer than any frame: a stray zero
+                    continue
+                if end == start + 1:
+                    start = end  # The second zero opens the next frame
+                    continue
+                event = decode_frame(bytes(buf[start + 1:end]))
+                if event is None:
+                    start += 1  # Not a frame: reread what follows as text
+                    continue
+                self._process_frame(*event)
+                start = end + 1
+            else:
+                nl = buf.find(b'\n', start)
+                zero = buf.find(b'\x00', start, nl if nl >= 0 else size)
+                if zero >= 0:
+                    # Bytes up to a zero with no newline: a frame whose opening
+                    # delimiter was lost, or a broken line that is dropped
+                    event = decode_frame(bytes(buf[start:zero]))
+                    if event is not None:
+                        self._process_frame(*event)
+                    start = zero
+                    continue
+                if nl < 0:
+                    break
+                line = bytes(buf[start:nl]).strip()
+                start = nl + 1
+                if line:
+                    self._process_message(line)
+        if start:
+            del buf[:start]
+    
     def _writer_loop(self):
         """Send commands to Arduino"""
-        while self.running and self.is_connected:
+        ser = self.serial_connection
+        write = ser.write
+        flush = ser.flush
+        wait = self._cmd_event.wait
+        clear = self._cmd_event.clear
+        pending = self.command_deque
+        pop = pending.popleft
+        fill = self._fill_tx_buffer
+        
+        while self.running and self._connected:
             try:
-                # Get command from queue (with timeout)
-                try:
-                    command = self.command_queue.get(timeout=0.1)
-                    if self.serial_connection and self.serial_connection.is_open:
-                        self.serial_connection.write(f"{command}\n".encode('utf-8'))
-                        self.serial_connection.flush()
-                    self.command_queue.task_done()
-                except queue.Empty:
+                # Sleep until send_command() signals new work (with timeout)
+                if not wait(timeout=0.1):
                     continue
+                clear()
+                
+                # Drain whatever is queued into the same write
+                commands = []
+                batch_size = 0
+                sync = False
+                while (pending and
+                       len(commands) < WRITE_BATCH_MAX_COMMANDS and
+                       batch_size < WRITE_BATCH_MAX_BYTES):
+                    try:
+                        command = pop()
+                    except IndexError:
+                        break
+                    if command is _FLUSH:
+                        sync = True
+                        continue
+                    commands.append(command)
+                    batch_size += len(command) + 1
+                
+                # Leftovers beyond the batch limit go out on the next pass
+                if pending:
+                    self._cmd_event.set()
+                
+                if commands and ser.is_open:
+                    n = fill(commands)
+                    write(memoryview(self._tx_buf)[:n])
+                
+                # Only block on tcdrain() when a caller asked for it
+                if sync and ser.is_open:
+                    flush()
                     
             except Exception as e:
                 print(f"Writer error: {e}")
                 break
     
-    def _process_message(self, message: str):
-        """Process incoming message from Arduino"""
-        try:
-            # Parse message type
-            if ':' in message:
-                msg_type, msg_data = message.split(':', 1)
+    def _fill_tx_buffer(self, commands) -> int:
+        """Encode text commands (newline-terminated) and binary frames into the reusable TX buffer"""
+        buf = self._tx_buf
+        n = 0
+        for command in commands:
+            if isinstance(command, bytes):
+                # Prebuilt frame, already delimited
+                end = n + len(command)
+                if end > len(buf):
+                    buf.extend(bytes(end - len(buf)))
+                buf[n:end] = command
             else:
-                msg_type = message
-                msg_data = ""
+                encoded = command.encode('utf-8')
+                end = n + len(encoded) + 1
+                if end > len(buf):
+                    buf.extend(bytes(end - len(buf)))
+                buf[n:end - 1] = encoded
+                buf[end - 1] = 0x0A  # '\n'
+            n = end
+        return n
+    
+    def _process_frame(self, msg_type: bytes, fields: tuple):
+        """Process a decoded binary slate event from Arduino"""
+        try:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("%s: %s", msg_type.decode('ascii'), fields)
             
-            # Update system state based on message
-            if msg_type == "READY":
-                print("Arduino is ready")
-                
-            elif msg_type == "PHASE_SET":
-                self.current_phase = int(msg_data)
-                print(f"Phase set to: {self.current_phase}")
-                
-            elif msg_type == "DISPLAYED":
-                print(f"Displayed text: {msg_data}")
-                
-            elif msg_type == "MIRRORED":
-                print(f"Displayed mirrored text: {msg_data}")
-                
-            elif msg_type == "BUTTON_PRESS":
-                self._handle_button_press(msg_data)
-                
-            elif msg_type == "BUTTON_RELEASE":
-                self._handle_button_release(msg_data)
-                
-            elif msg_type == "DOT_PRESSED":
-                self._handle_dot_press(msg_data)
-                
-            elif msg_type == "HEARTBEAT":
-                self.last_heartbeat = time.time()
-                
-            elif msg_type == "ERROR":
-                print(f"Arduino error: {msg_data}")
+            callback = self._raw_callbacks.get(msg_type)
+            if callback:
+                callback(*fields)
                 
+        except Exception as e:
+            print(f"Error processing {msg_type.decode('ascii')} frame: {e}")
+    
+    def _process_message(self, message: bytes):
+        """Process incoming message from Arduino"""
+        try:
+            msg_type, _, msg_data = message.partition(b':')
+            
+            # Built-in handlers update state and return the callback arguments,
+            # or None when the message could not be parsed
+            handler = self._handlers.get(msg_type)
+            args = handler(msg_data) if handler else (msg_data,)
+            
             # Call registered callback if available
-            callback = self.callbacks.get(msg_type)
-            if callback:
-                callback(msg_data)
+            callback = self._raw_callbacks.get(msg_type)
+            if callback and args is not None:
+                callback(*args)
                 
         except Exception as e:
-            print(f"Error processing message '{message}': {e}")
+            print(f"Error processing message {message!r}: {e}")
+    
+    def _on_ready(self, data: bytes):
+        """Handle Arduino ready notification"""
+        print("Arduino is ready")
+        return (data.decode('utf-8', 'replace'),)
+    
+    def _on_phase_set(self, data: bytes):
+        """Handle phase change confirmation"""
+        self.current_phase = int(data)
+        print(f"Phase set to: {self.current_phase}")
+        return (data.decode('utf-8', 'replace'),)
+    
+    def _on_displayed(self, data: bytes):
+        """Handle display confirmation"""
+        text = data.decode('utf-8', 'replace')
+        print(f"Displayed text: {text}")
+        return (text,)
+    
+    def _on_mirrored(self, data: bytes):
+        """Handle mirrored display confirmation"""
+        text = data.decode('utf-8', 'replace')
+        print(f"Displayed mirrored text: {text}")
+        return (text,)
     
-    def _handle_button_press(self, data: str):
+    def _on_heartbeat(self, data: bytes):
+        """Handle heartbeat from Arduino"""
+        self.last_heartbeat = time.time()
+        return (data.decode('utf-8', 'replace'),)
+    
+    def _on_error(self, data: bytes):
+        """Handle error report from Arduino"""
+        text = data.decode('utf-8', 'replace')
+        print(f"Arduino error: {text}")
+        return (text,)
+    
+    @staticmethod
+    def _parse_ints(data: bytes, n: int) -> tuple:
+        """Parse exactly n comma-separated unsigned ints in a single pass"""
+        out = [0] * n
+        idx = 0
+        value = 0
+        digits = 0
+        for b in data:
+            if b == 0x2C:  # ','
+                if not digits or idx == n - 1:
+                    raise ValueError(f"malformed payload: {data!r}")
+                out[idx] = value
+                idx += 1
+                value = 0
+                digits = 0
+            elif 0x30 <= b <= 0x39:  # '0'-'9'
+                value = value * 10 + (b - 0x30)
+                digits += 1
+            else:
+                raise ValueError(f"malformed payload: {data!r}")
+        if not digits or idx != n - 1:
+            raise ValueError(f"malformed payload: {data!r}")
+        out[idx] = value
+        return tuple(out)
+    
+    def _handle_button_press(self, data: bytes):
         """Handle button press from writing slate"""
         try:
-            parts = data.split(',')
-            if len(parts) >= 4:
-                row, col, cell, dot = map(int, parts)
-                print(f"Button pressed: row={row}, col={col}, cell={cell}, dot={dot}")
-                
-                # Call callback if registered
-                callback = self.callbacks.get('BUTTON_PRESS')
-                if callback:
-                    callback(row, col, cell, dot)
+            fields = self._parse_ints(data, 4)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Button pressed: row=%d, col=%d, cell=%d, dot=%d", *fields)
+            return fields
                     
         except Exception as e:
             print(f"Error handling button press: {e}")
+        return None
     
-    def _handle_button_release(self, data: str):
+    def _handle_button_release(self, data: bytes):
         """Handle button release from writing slate"""
         try:
-            parts = data.split(',')
-            if len(parts) >= 4:
-                row, col, cell, dot = map(int, parts)
-                print(f"Button released: row={row}, col={col}, cell={cell}, dot={dot}")
-                
-                # Call callback if registered
-                callback = self.callbacks.get('BUTTON_RELEASE')
-                if callback:
-                    callback(row, col, cell, dot)
+            fields = self._parse_ints(data, 4)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Button released: row=%d, col=%d, cell=%d, dot=%d", *fields)
+            return fields
                     
         except Exception as e:
             print(f"Error handling button release: {e}")
+        return None
     
-    def _handle_dot_press(self, data: str):
+    def _handle_dot_press(self, data: bytes):
         """Handle dot press in embossing phase"""
         try:
-            parts = data.split(',')
-            if len(parts) >= 2:
-                cell, dot = map(int, parts)
-                print(f"Dot pressed: cell={cell}, dot={dot}")
-                
-                # Call callback if registered
-                callback = self.callbacks.get('DOT_PRESSED')
-                if callback:
-                    callback(cell, dot)
+            fields = self._parse_ints(data, 2)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Dot pressed: cell=%d, dot=%d", *fields)
+            return fields
                     
         except Exception as e:
             print(f"Error handling dot press: {e}")
+        return None
     
     # Command methods
     def set_phase(self, phase: int):
@@ -276,6 +620,16 @@ class ArduinoController:
         """Display mirrored text for writing practice"""
         self.send_command(f"MIRROR:{text}")
     
+    def set_cell(self, cell: int, pattern: int):
+        """Set one display cell to a 6-bit dot pattern"""
+        if not 0 <= cell < NUM_BRAILLE_CELLS:
+            print(f"Invalid cell index: {cell}")
+            return
+        if self._connected:
+            self._enqueue(SET_CELL_FRAMES[cell][pattern & 0x3F])
+        else:
+            print(f"Cannot set cell - not connected: {cell}")
+    
     def clear_display(self):
         """Clear Braille display"""
         self.send_command("CLEAR")
@@ -298,20 +652,67 @@ class ArduinoController:
         """Request status from Arduino"""
         self.send_command("STATUS")
     
-    def send_command(self, command: str):
-        """Send command to Arduino"""
-        if self.is_connected:
-            self.command_queue.put(command)
+    def send_command(self, command: str, sync: bool = False):
+        """Send command to Arduino (sync=True drains the port after writing it)"""
+        if self._connected:
+            if sync:
+                self._enqueue(command, _FLUSH)
+            else:
+                self._enqueue(command)
         else:
             print(f"Cannot send command - not connected: {command}")
     
+    def _enqueue(self, *items):
+        """Queue items for the writer, or hold them while this thread is in batch()"""
+        held = getattr(self._batching, 'items', None)
+        if held is not None:
+            held.extend(items)
+            return
+        self.command_deque.extend(items)
+        self._cmd_event.set()
+    
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Send every command issued inside the block as a single serial write
+        
+        Commands are held back and handed to the writer together on exit, so
+        it coalesces them into one write (up to WRITE_BATCH_MAX_COMMANDS).
+        """
+        if getattr(self._batching, 'items', None) is not None:
+            yield  # Nested: the outermost batch sends everything
+            return
+        
+        held = self._batching.items = []
+        try:
+            yield
+        finally:
+            self._batching.items = None
+            if held:
+                self.command_deque.extend(held)
+                self._cmd_event.set()
+    
     def register_callback(self, message_type: str, callback: Callable):
         """Register callback for specific message type"""
         if message_type in self.callbacks:
             self.callbacks[message_type] = callback
+            self._raw_callbacks[message_type.encode('ascii')] = callback
         else:
             print(f"Unknown message type: {message_type}")
     
+    def register_callbacks(self, mapping: dict):
+        """Register several message callbacks at once"""
+        unknown = [message_type for message_type in mapping if message_type not in self.callbacks]
+        if unknown:
+            print(f"Unknown message types: {', '.join(unknown)}")
+        known = {message_type: callback for message_type, callback in mapping.items()
+                 if message_type in self.callbacks}
+        
+        # dict.update is atomic for the reader thread's lookups, so no lock
+        self.callbacks.update(known)
+        self._raw_callbacks.update(
+            {message_type.encode('ascii'): callback for message_type, callback in known.items()})
+    
     def start(self):
         """Start Arduino communication"""
         return self.connect()
@@ -325,10 +726,10 @@ class ArduinoController:
     
     def is_connected(self) -> bool:
         """Check if Arduino is connected and responsive"""
-        if not self.is_connected:
+        if not self._connected:
             return False
         # Check heartbeat
-        return self.is_arduino_alive()
+        return (time.time() - self.last_heartbeat) < HEARTBEAT_TIMEOUT
 
 
 # Singleton management (updated)
@@ -338,6 +739,10 @@ _arduino_controller_lock = threading.Lock()
 def get_arduino_controller() -> ArduinoController:
     """Get the singleton Arduino controller instance"""
     global _arduino_controller_instance
+    # Fast path: reading the global is atomic, so only creation needs the lock
+    instance = _arduino_controller_instance
+    if instance is not None:
+        return instance
     with _arduino_controller_lock:
         if _arduino_controller_instance is None:
             _arduino_controller_instance = ArduinoController()
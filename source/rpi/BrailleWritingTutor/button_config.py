@@ -6,54 +6,97 @@ Integrates with Phase Manager and Arduino Controller
 import pigpio
 import time
 import threading
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Callable
 from pins_config import BUTTON_PINS, KNOB_PINS
 from gtts_config import get_braille_tts
+from phase_manager import get_phase_manager, TutoringPhases
 
 
-# Singleton instance
-_button_manager_instance = None
-_button_manager_lock = threading.Lock()
+log = logging.getLogger("braille.buttons")
+
+
+# Quadrature transition table indexed by (previous AB << 2) | new AB, where
+# A is CLK and B is DT. +1 is clockwise, -1 counter-clockwise, 0 is either
+# no movement or an invalid (bounced) transition that skipped a state.
+_QUAD_LUT = (
+    0, -1, +1, 0,
+    +1, 0, 0, -1,
+    -1, 0, 0, +1,
+    0, +1, -1, 0,
+)
+# Valid transitions per detent (one full quadrature cycle)
+KNOB_TRANSITIONS_PER_STEP = 4
+# Quiet time after the last detent before the phase change is applied
+KNOB_SETTLE_SECONDS = 0.15
 
 
 class EnhancedButtonManager:
+    # Phase manager method run by each button
+    _PHASE_HANDLERS = {
+        'REGISTER': 'handle_register_button',
+        'ERASE': 'handle_erase_button',
+        'READ': 'handle_read_button',
+        'DISPLAY': 'handle_display_button',
+    }
+    
     def __init__(self):
         self.buttons = BUTTON_PINS
         self.knob_pins = KNOB_PINS
+        self.pin_masks = {name: 1 << pin for name, pin in self.buttons.items()}
+        self._pin_to_name = {pin: name for name, pin in self.buttons.items()}
+        self._pin_to_name[self.knob_pins['SW']] = 'KNOB_SW'
         self.button_callbacks: Dict[str, Callable] = {}
-        self.debounce_delay = 200000  # 200ms debounce delay in microseconds
-        self.last_press_time = {}
+        self.debounce_us = 50_000  # 50ms pigpio glitch filter (debounce) in microseconds
+        self.repress_guard_us = 50_000  # Minimum time between accepted presses of one pin
+        self._last_press_tick: Dict[int, int] = {}
         self.running = False
-        self.button_threads = []
         self.thread_lock = threading.Lock()
         
+        # Long-lived workers for button callbacks (no thread per press)
+        self._executor = self._create_executor()
+        
         # Knob/rotary encoder state
         self.knob_position = 0
-        self.last_clk_state = None
-        self.knob_lock = threading.Lock()
+        self._knob_ab_state = 0b11
+        self._knob_accum = 0
+        # One settle worker per spin waits for this deadline (monotonic
+        # seconds) to stop moving; None means no knob change is pending
+        self._knob_settle_deadline = None
+        self._knob_settle_cond = threading.Condition()
+        self._knob_settle_thread = None
         
-        # Manager instances (lazy loaded to avoid circular imports)
+        # Phase manager and TTS, injected by bind_managers() or resolved on
+        # first use, so setting up GPIO never starts audio or synthesis
         self._phase_manager = None
-        self._arduino = None
+        self._tts = None
         
-        # Initialize pigpio
+        # Initialize pigpio; all callbacks run on its single notification thread
         self.pi = None
+        self._gpio_callbacks = []
         self._setup_gpio()
         self._register_default_callbacks()
         
+    def bind_managers(self, phase_manager, tts=None):
+        """Bind the phase manager (and optionally TTS) used by all button handlers"""
+        self._phase_manager = phase_manager
+        if tts is not None:
+            self._tts = tts
+        self._register_default_callbacks()
+    
     def _get_phase_manager(self):
-        """Lazy load phase manager to avoid circular imports"""
+        """Phase manager bound by bind_managers(), else the shared instance"""
         if self._phase_manager is None:
-            from phase_manager import get_phase_manager
             self._phase_manager = get_phase_manager()
         return self._phase_manager
     
-    def _get_arduino_controller(self):
-        """Lazy load arduino controller to avoid circular imports"""
-        if self._arduino is None:
-            from arduino_controller import get_arduino_controller
-            self._arduino = get_arduino_controller()
-        return self._arduino
+    def _get_tts(self):
+        """TTS bound by bind_managers(), else the shared instance"""
+        if self._tts is None:
+            self._tts = get_braille_tts()
+        return self._tts
         
     def _setup_gpio(self):
         """Initialize GPIO settings for buttons and knob using pigpio"""
@@ -63,16 +106,15 @@ class EnhancedButtonManager:
             if not self.pi.connected:
                 raise RuntimeError("Failed to connect to pigpiod. Make sure pigpiod is running.")
             
-            # Setup each button pin with pull-up resistor
-            for button_name, pin in self.buttons.items():
+            # Setup each button pin with pull-up resistor and a falling edge
+            # callback; pigpiod debounces the line so bounces never reach Python
+            debounce_us = self.debounce_us
+            for pin in self.buttons.values():
                 self.pi.set_mode(pin, pigpio.INPUT)
                 self.pi.set_pull_up_down(pin, pigpio.PUD_UP)
-                self.last_press_time[button_name] = 0
-                
-            # Setup callback for each button (falling edge detection)
-            for button_name, pin in self.buttons.items():
-                self.pi.callback(pin, pigpio.FALLING_EDGE, 
-                               lambda gpio, level, tick, name=button_name: self._button_interrupt_handler(name))
+                self.pi.set_glitch_filter(pin, debounce_us)
+                self._gpio_callbacks.append(
+                    self.pi.callback(pin, pigpio.FALLING_EDGE, self._on_button_edge))
             
             # Setup knob/rotary encoder pins
             self.pi.set_mode(self.knob_pins['CLK'], pigpio.INPUT)
@@ -83,156 +125,172 @@ class EnhancedButtonManager:
             
             self.pi.set_mode(self.knob_pins['SW'], pigpio.INPUT)
             self.pi.set_pull_up_down(self.knob_pins['SW'], pigpio.PUD_UP)
+            self.pi.set_glitch_filter(self.knob_pins['SW'], self.debounce_us)
             
-            # Add knob switch to button tracking
-            self.last_press_time['KNOB_SW'] = 0
-            
-            # Setup knob interrupts
-            self.pi.callback(self.knob_pins['CLK'], pigpio.EITHER_EDGE, self._handle_knob_rotation)
-            self.pi.callback(self.knob_pins['SW'], pigpio.FALLING_EDGE,
-                           lambda gpio, level, tick: self._button_interrupt_handler('KNOB_SW'))
+            # Setup knob interrupts; both encoder lines feed the quadrature table
+            self._knob_ab_state = (self.pi.read(self.knob_pins['CLK']) << 1) | self.pi.read(self.knob_pins['DT'])
+            self._gpio_callbacks.extend([
+                self.pi.callback(self.knob_pins['CLK'], pigpio.EITHER_EDGE, self._handle_knob_rotation),
+                self.pi.callback(self.knob_pins['DT'], pigpio.EITHER_EDGE, self._handle_knob_rotation),
+                self.pi.callback(self.knob_pins['SW'], pigpio.FALLING_EDGE, self._on_button_edge),
+            ])
                                 
         except Exception as e:
             raise RuntimeError(f"Failed to add edge detection: {e}")
             
-    def _button_interrupt_handler(self, button_name: str):
-        """GPIO interrupt handler for button presses"""
-        current_time = time.time()
+    def _on_button_edge(self, gpio, level, tick):
+        """Shared pigpio callback for all buttons and the knob switch, resolved by pin number"""
+        button_name = self._pin_to_name.get(gpio)
+        if not button_name:
+            return
         
-        # Thread-safe debouncing check
-        with self.thread_lock:
-            if current_time - self.last_press_time[button_name] < self.debounce_delay:
-                return
-            self.last_press_time[button_name] = current_time
+        # Second line of defence behind the glitch filter: drop residual
+        # glitches that land within the guard window of the last press.
+        # pigpio's tick is the daemon's µs timestamp, so no clock read here.
+        last = self._last_press_tick.get(gpio)
+        if last is not None and pigpio.tickDiff(last, tick) < self.repress_guard_us:
+            return
+        self._last_press_tick[gpio] = tick
         
-        # Execute callback in a separate thread to avoid blocking
+        self._button_interrupt_handler(button_name)
+    
+    def _button_interrupt_handler(self, button_name: str):
+        """GPIO interrupt handler for button presses (already debounced by pigpiod)"""
+        # Execute callback on the worker pool to avoid blocking
         callback = self.button_callbacks.get(button_name)
-        if callback:
-            thread = threading.Thread(
-                target=self._execute_callback,
-                args=(button_name, callback),
-                daemon=True
-            )
-            thread.start()
+        executor = self._executor
+        if callback and executor is not None:
+            try:
+                executor.submit(self._execute_callback, button_name, callback)
+            except RuntimeError:
+                pass  # Pool shut down by stop_monitoring() in the meantime
+    
+    @staticmethod
+    def _create_executor() -> ThreadPoolExecutor:
+        """Create the worker pool that runs button callbacks"""
+        return ThreadPoolExecutor(max_workers=2, thread_name_prefix="btn")
     
     def _execute_callback(self, button_name: str, callback: Callable):
-        """Execute button callback in a separate thread"""
+        """Execute button callback on a worker thread"""
         try:
             callback()
         except Exception as e:
-            print(f"Error executing callback for {button_name}: {e}")
+            log.error("Error executing callback for %s: %s", button_name, e)
             # Provide audio feedback for errors
             try:
-                tts = get_braille_tts()
-                tts.speak("Error sa button operation")
+                self._get_tts().speak("Error sa button operation")
             except:
                 pass
     
     def _register_default_callbacks(self):
         """Register default callbacks for all buttons"""
         try:
-            self.register_callback('REGISTER', self._handle_register_button)
-            self.register_callback('ERASE', self._handle_erase_button)
-            self.register_callback('READ', self._handle_read_button)
-            self.register_callback('DISPLAY', self._handle_display_button)
-            self.register_callback('KNOB_SW', self._handle_knob_button)
+            # Bind straight to a bound phase manager; until then each press
+            # resolves it. _execute_callback handles errors either way
+            phase_manager = self._phase_manager
+            if phase_manager is None:
+                callbacks = {name: functools.partial(self._call_phase_handler, handler)
+                             for name, handler in self._PHASE_HANDLERS.items()}
+            else:
+                callbacks = {name: getattr(phase_manager, handler)
+                             for name, handler in self._PHASE_HANDLERS.items()}
+            callbacks['KNOB_SW'] = self._handle_knob_button
+            with self.thread_lock:
+                self.button_callbacks.update(callbacks)
         except Exception as e:
             print(f"Error registering default callbacks: {e}")
     
-    def _handle_register_button(self):
-        """Handle register button press with phase integration"""
-        print("Register button pressed")
-        try:
-            phase_manager = self._get_phase_manager()
-            phase_manager.handle_register_button()
-        except Exception as e:
-            print(f"Error in register button handler: {e}")
-    
-    def _handle_erase_button(self):
-        """Handle erase button press with phase integration"""
-        print("Erase button pressed")
-        try:
-            phase_manager = self._get_phase_manager()
-            phase_manager.handle_erase_button()
-        except Exception as e:
-            print(f"Error in erase button handler: {e}")
-    
-    def _handle_read_button(self):
-        """Handle read button press with phase integration"""
-        print("Read button pressed")
-        try:
-            phase_manager = self._get_phase_manager()
-            phase_manager.handle_read_button()
-        except Exception as e:
-            print(f"Error in read button handler: {e}")
-    
-    def _handle_display_button(self):
-        """Handle display button press with phase integration"""
-        print("Display button pressed")
-        try:
-            phase_manager = self._get_phase_manager()
-            phase_manager.handle_display_button()
-        except Exception as e:
-            print(f"Error in display button handler: {e}")
+    def _call_phase_handler(self, handler: str):
+        """Run a phase manager handler, resolving the phase manager on first use"""
+        getattr(self._get_phase_manager(), handler)()
     
     def _handle_knob_button(self):
         """Handle knob button press (emergency stop/power toggle)"""
-        print("Knob button pressed")
-        try:
-            from phase_manager import TutoringPhases
-            phase_manager = self._get_phase_manager()
-            current_phase = phase_manager.get_current_phase()
-            
-            if current_phase == TutoringPhases.OFF:
-                # Turn on system - start with Phase 1
-                phase_manager.set_phase(TutoringPhases.EMBOSSING)
-                self.knob_position = TutoringPhases.EMBOSSING
-                tts = get_braille_tts()
-                tts.speak("Sistema binuksan. Nagsimula sa Phase 1.")
-            else:
-                # Emergency stop - turn off system
-                phase_manager.set_phase(TutoringPhases.OFF)
-                self.knob_position = TutoringPhases.OFF
-                tts = get_braille_tts()
-                tts.speak("Emergency stop. Sistema naka-off na.")
-                
-        except Exception as e:
-            print(f"Error in knob button handler: {e}")
+        phase_manager = self._get_phase_manager()
+        tts = self._get_tts()
+        
+        if phase_manager.get_current_phase() == TutoringPhases.OFF:
+            # Turn on system - start with Phase 1
+            phase_manager.set_phase(TutoringPhases.EMBOSSING)
+            self.knob_position = TutoringPhases.EMBOSSING
+            tts.speak("Sistema binuksan. Nagsimula sa Phase 1.")
+        else:
+            # Emergency stop - turn off system
+            phase_manager.set_phase(TutoringPhases.OFF)
+            self.knob_position = TutoringPhases.OFF
+            tts.speak("Emergency stop. Sistema naka-off na.")
     
     def _handle_knob_rotation(self, gpio, level, tick):
         """Handle rotary encoder rotation for phase selection"""
-        with self.knob_lock:
-            clk_state = self.pi.read(self.knob_pins['CLK'])
-            dt_state = self.pi.read(self.knob_pins['DT'])
+        if level > 1:
+            return  # pigpio watchdog timeout, not an edge
+        
+        # Encoder state is only touched from pigpio's single callback thread,
+        # and knob_position is published with one attribute store, so no lock.
+        # pigpio reports the new level, so only the edge's own bit changes
+        if gpio == self.knob_pins['CLK']:
+            new_state = (level << 1) | (self._knob_ab_state & 0b01)
+        else:
+            new_state = (self._knob_ab_state & 0b10) | level
+        
+        self._knob_accum += _QUAD_LUT[(self._knob_ab_state << 2) | new_state]
+        self._knob_ab_state = new_state
+        
+        if abs(self._knob_accum) < KNOB_TRANSITIONS_PER_STEP:
+            return
+        
+        try:
+            if self._knob_accum > 0:
+                # Clockwise rotation - next phase
+                position = self.knob_position + 1
+                direction = "clockwise"
+            else:
+                # Counter-clockwise rotation - previous phase
+                position = self.knob_position - 1
+                direction = "counter-clockwise"
+            self._knob_accum = 0
             
-            if self.last_clk_state is None:
-                self.last_clk_state = clk_state
-                return
+            # Keep position within valid range (0-6 for phases)
+            self.knob_position = max(0, min(6, position))
+            
+            log.debug("Knob rotated %s, position: %d", direction, self.knob_position)
             
-            if clk_state != self.last_clk_state:
-                try:
-                    if dt_state != clk_state:
-                        # Clockwise rotation - next phase
-                        self.knob_position += 1
-                        direction = "clockwise"
-                    else:
-                        # Counter-clockwise rotation - previous phase
-                        self.knob_position -= 1
-                        direction = "counter-clockwise"
-                    
-                    # Keep position within valid range (0-6 for phases)
-                    self.knob_position = max(0, min(6, self.knob_position))
-                    
-                    print(f"Knob rotated {direction}, position: {self.knob_position}")
-                    
-                    # Update phase
-                    phase_manager = self._get_phase_manager()
-                    phase_manager.set_phase(self.knob_position)
-                    
-                except Exception as e:
-                    print(f"Error in knob rotation handler: {e}")
+            # Update phase once the knob settles, not on every detent of a
+            # spin: each detent only pushes the deadline back
+            with self._knob_settle_cond:
+                self._knob_settle_deadline = time.monotonic() + KNOB_SETTLE_SECONDS
+                if self._knob_settle_thread is None:
+                    self._knob_settle_thread = threading.Thread(
+                        target=self._knob_settle_worker, name="knob-settle", daemon=True)
+                    self._knob_settle_thread.start()
             
-            self.last_clk_state = clk_state
+        except Exception as e:
+            log.error("Error in knob rotation handler: %s", e)
+    
+    def _knob_settle_worker(self):
+        """Wait until no detent has arrived for KNOB_SETTLE_SECONDS, then apply it"""
+        cond = self._knob_settle_cond
+        with cond:
+            while True:
+                deadline = self._knob_settle_deadline
+                if deadline is None:
+                    # Cancelled by stop_monitoring()
+                    self._knob_settle_thread = None
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                cond.wait(remaining)
+            self._knob_settle_deadline = None
+            self._knob_settle_thread = None
+        self._flush_knob()
+    
+    def _flush_knob(self):
+        """Apply the settled knob position as the current phase"""
+        try:
+            self._get_phase_manager().set_phase(self.knob_position)
+        except Exception as e:
+            log.error("Error applying knob position: %s", e)
     
     def get_knob_position(self) -> int:
         """Get current knob position"""
@@ -240,8 +298,7 @@ class EnhancedButtonManager:
     
     def set_knob_position(self, position: int):
         """Set knob position (for synchronization)"""
-        with self.knob_lock:
-            self.knob_position = max(0, min(6, position))
+        self.knob_position = max(0, min(6, position))
     
     def register_callback(self, button_name: str, callback: Callable):
         """Register a callback function for a specific button"""
@@ -254,33 +311,51 @@ class EnhancedButtonManager:
     def start_monitoring(self):
         """Start the button monitoring system"""
         self.running = True
+        if self._executor is None:
+            self._executor = self._create_executor()
         print("Enhanced button monitoring started with GPIO interrupts and knob support")
         
     def stop_monitoring(self):
         """Stop the button monitoring system"""
         self.running = False
         
-        # Wait for any running callback threads to complete
-        for thread in threading.enumerate():
-            if thread != threading.current_thread() and thread.daemon:
-                thread.join(timeout=1.0)
+        # Drop a knob change that has not settled yet
+        with self._knob_settle_cond:
+            self._knob_settle_deadline = None
+            self._knob_settle_cond.notify_all()
+        
+        # Let running callbacks finish and drop any that have not started
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
         
         print("Button monitoring stopped")
     
     def is_button_pressed(self, button_name: str) -> bool:
         """Check if a button is currently pressed (manual check)"""
-        if button_name not in self.buttons:
+        mask = self.pin_masks.get(button_name)
+        if mask is None:
             return False
-            
-        pin = self.buttons[button_name]
+        
         # Button is pressed when GPIO reads LOW (pull-up configuration)
-        return self.pi.read(pin) == 0
+        return not (self.pi.read_bank_1() & mask)
+    
+    def get_pressed_buttons(self) -> Dict[str, bool]:
+        """Check all buttons at once with a single GPIO bank read"""
+        # Bank 1 holds the levels of GPIO 0-31 as one bitmask
+        levels = self.pi.read_bank_1()
+        return {name: not (levels & mask) for name, mask in self.pin_masks.items()}
     
     def cleanup(self):
         """Clean up GPIO resources"""
         try:
             self.stop_monitoring()
             
+            # Detach edge callbacks before closing the notification channel
+            for cb in self._gpio_callbacks:
+                cb.cancel()
+            self._gpio_callbacks.clear()
+            
             # Stop pigpio connection
             if self.pi is not None:
                 self.pi.stop()
@@ -329,21 +404,16 @@ def on_display_button():
 
 
 # Singleton management functions
+@functools.cache
 def get_button_manager() -> EnhancedButtonManager:
     """Get the singleton button manager instance"""
-    global _button_manager_instance
-    with _button_manager_lock:
-        if _button_manager_instance is None:
-            _button_manager_instance = EnhancedButtonManager()
-        return _button_manager_instance
+    return EnhancedButtonManager()
 
 def cleanup_button_manager():
     """Clean up the button manager singleton"""
-    global _button_manager_instance
-    with _button_manager_lock:
-        if _button_manager_instance is not None:
-            _button_manager_instance.cleanup()
-            _button_manager_instance = None
+    if get_button_manager.cache_info().currsize:
+        get_button_manager().cleanup()
+    get_button_manager.cache_clear()
 
 
 # Maintain backward compatibility
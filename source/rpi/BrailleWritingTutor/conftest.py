@@ -0,0 +1,245 @@
+"""
+Shared pytest fixtures for the Braille Writing Tutor tests
+Keeps the suites fast and hardware-free
+"""
+
+import collections
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, patch
+
+import pytest
+
+# Use the silent TTS manager (no pygame mixer, no speech worker) unless a
+# run asks for real audio, e.g. BWT_TTS_BACKEND=gtts
+os.environ.setdefault('BWT_TTS_BACKEND', 'null')
+
+# Set BWT_VERBOSE=1 (with pytest -s) to print extra debug output
+VERBOSE = bool(os.environ.get('BWT_VERBOSE'))
+
+
+# Tutor modules the component tests exercise, imported once per session
+TUTOR_MODULES = (
+    'gtts_config',
+    'pins_config',
+    'arduino_controller',
+    'phase_manager',
+    'button_config',
+    'main',
+)
+
+
+class FakeClock:
+    """Virtual clock: sleeping advances time instantly instead of waiting"""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def time(self) -> float:
+        """Current virtual time in seconds"""
+        return self.now
+
+    def sleep(self, seconds: float):
+        """Advance the clock by seconds without blocking"""
+        self.advance(seconds)
+
+    def advance(self, seconds: float):
+        """Move the clock forward (tests use this to simulate elapsed time)"""
+        self.now += max(0.0, seconds)
+
+
+class MockSerial:
+    """In-memory stand-in for serial.Serial that records every call"""
+
+    # Longest a read waits for seeded data; pyserial may return early on
+    # timeout too, and a short wait keeps disconnect() joins quick
+    MAX_READ_WAIT = 0.05
+
+    def __init__(self, port=None, baudrate=9600, timeout=None, latency_ms=0, **kwargs):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.latency_ms = latency_ms  # Simulated I/O delay per write (virtual clock)
+        self.is_open = True
+        self.calls = []
+        self.seed_reads = collections.deque()
+        self.written = bytearray()
+        self._cond = threading.Condition()
+
+    def fileno(self):
+        """No descriptor, so ArduinoController falls back to its blocking reader"""
+        raise OSError("MockSerial has no file descriptor")
+
+    def seed(self, data: bytes):
+        """Queue bytes for the controller to read"""
+        with self._cond:
+            self.seed_reads.append(bytes(data))
+            self._cond.notify_all()
+
+    @property
+    def in_waiting(self) -> int:
+        return sum(len(chunk) for chunk in self.seed_reads)
+
+    def _take(self, size: int, until: bytes = None) -> bytes:
+        """Pop up to size seeded bytes, stopping after until if given"""
+        out = bytearray()
+        while self.seed_reads and len(out) < size:
+            chunk = self.seed_reads.popleft()
+            end = size - len(out)
+            if until is not None and until in chunk[:end]:
+                end = chunk.index(until) + len(until)
+            out += chunk[:end]
+            if chunk[end:]:
+                self.seed_reads.appendleft(chunk[end:])
+            if until is not None and out.endswith(until):
+                break
+        return bytes(out)
+
+    def _wait_for_data(self):
+        if not self.seed_reads and self.is_open:
+            self._cond.wait(min(self.timeout or self.MAX_READ_WAIT, self.MAX_READ_WAIT))
+
+    def read(self, size: int = 1) -> bytes:
+        with self._cond:
+            self._wait_for_data()
+            data = self._take(size)
+        if data:
+            self.calls.append(("read", data))
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        with self._cond:
+            self._wait_for_data()
+            data = self._take(size if size >= 0 else sys.maxsize, until=b'\n')
+        if data:
+            self.calls.append(("readline", data))
+        return data
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        with self._cond:
+            self.calls.append(("write", data))
+            self.written += data
+            self._cond.notify_all()
+        return len(data)
+
+    def wait_for_write(self, expected: bytes, timeout: float = 1.0) -> bool:
+        """Wait until the written bytes contain expected"""
+        with self._cond:
+            return self._cond.wait_for(lambda: expected in self.written, timeout)
+
+    def flush(self):
+        self.calls.append(("flush",))
+
+    def close(self):
+        with self._cond:
+            self.is_open = False
+            self.calls.append(("close",))
+            self._cond.notify_all()
+
+
+@pytest.fixture(scope="session")
+def verbose():
+    """True when the run asked for debug output (BWT_VERBOSE)"""
+    return VERBOSE
+
+
+@pytest.fixture(autouse=True)
+def fake_clock(monkeypatch):
+    """Replace time.sleep and time.time with a virtual clock for every test"""
+    clock = FakeClock(time.time())
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    monkeypatch.setattr(time, "time", clock.time)
+    return clock
+
+
+def _silent_pygame():
+    """pygame stand-in whose mixer reports that there is no audio device"""
+    import pygame
+    stub = MagicMock(error=pygame.error)
+    stub.mixer.init.side_effect = pygame.error("audio output is disabled under test")
+    return stub
+
+
+# Hardware stand-ins, built once when pytest loads this file; no test needs
+# its own copy, so every session and fixture shares these
+_PIGPIO_MOCK = MagicMock()
+_PYGAME_MOCK = _silent_pygame()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def hardware_stubs():
+    """Stub GPIO, serial ports and audio output once for the whole session"""
+    with ExitStack() as stack:
+        stack.enter_context(patch.dict(sys.modules, {'pigpio': _PIGPIO_MOCK}))
+        serial = importlib.import_module('serial')
+        gtts_config = importlib.import_module('gtts_config')
+        yield SimpleNamespace(
+            pigpio=_PIGPIO_MOCK,
+            Serial=stack.enter_context(patch.object(serial, 'Serial')),
+            pygame=stack.enter_context(patch.object(gtts_config, 'pygame', _PYGAME_MOCK)),
+        )
+
+
+@pytest.fixture(scope="session")
+def mocked_modules(hardware_stubs):
+    """Import every tutor module once, against the hardware stubs, and share them"""
+    try:
+        modules = {name: importlib.import_module(name) for name in TUTOR_MODULES}
+    except ImportError as e:
+        pytest.fail(f"Could not import {e.name}: {e}")
+    return SimpleNamespace(**modules)
+
+
+@pytest.fixture(scope="session")
+def patched(mocked_modules):
+    """Enter the collaborator patches once and share the mocks"""
+    m = mocked_modules
+    with ExitStack() as stack:
+        # One patch.multiple per module instead of one patcher per name
+        button = stack.enter_context(patch.multiple(
+            m.button_config, get_braille_tts=DEFAULT, get_phase_manager=DEFAULT))
+        phase = stack.enter_context(patch.multiple(m.phase_manager, get_braille_tts=DEFAULT))
+        yield SimpleNamespace(
+            phase_tts=phase['get_braille_tts'],
+            button_tts=button['get_braille_tts'],
+            get_phase_manager=button['get_phase_manager'],
+        )
+
+
+@pytest.fixture(scope="session")
+def tutor(mocked_modules, patched):
+    """Shared manager singletons, cleaned up once at the end of the session"""
+    m = mocked_modules
+    yield SimpleNamespace(
+        tts=m.gtts_config.get_braille_tts(),
+        arduino=m.arduino_controller.get_arduino_controller(),
+        phase_manager=m.phase_manager.get_phase_manager(),
+    )
+    m.phase_manager.cleanup_phase_manager()
+    m.arduino_controller.cleanup_arduino_controller()
+    m.button_config.cleanup_button_manager()
+    m.gtts_config.cleanup_tts()
+
+
+@pytest.fixture
+def mock_serial(monkeypatch, mocked_modules):
+    """Route ArduinoController's serial port to a MockSerial and return it"""
+    port = MockSerial()
+
+    def open_port(**kwargs):
+        port.port = kwargs.get('port')
+        port.baudrate = kwargs.get('baudrate', 9600)
+        port.timeout = kwargs.get('timeout')
+        port.is_open = True
+        return port
+
+    monkeypatch.setattr(mocked_modules.arduino_controller.serial, 'Serial', open_port)
+    return port
@@ -4,16 +4,99 @@ Handles text-to-speech functionality for audio feedback
 """
 
 import os
+import hashlib
+import json
+import functools
+from collections import OrderedDict
+import shutil
+import queue
+import subprocess
 import tempfile
+import wave
 import pygame
 from gtts import gTTS
 from io import BytesIO
 import threading
-import time
+from concurrent.futures import Future
+
+
+# Synthesized audio is kept here so known phrases play offline after first use
+TTS_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'braille_writing_tutor', 'tts')
+
+# Synthesized clips kept in memory, least recently used evicted first
+TTS_MEMORY_CACHE_SIZE = 256
+
+# Utterances waiting to be spoken; further requests are dropped when full
+SPEECH_QUEUE_SIZE = 16
+
+# Offline Piper voice (.onnx with its .onnx.json next to it); unset uses gTTS
+PIPER_MODEL = os.environ.get('PIPER_MODEL', '')
+
+# "null" swaps in a silent manager that never touches the audio device (tests)
+TTS_BACKEND = os.environ.get('BWT_TTS_BACKEND', '')
+
+
+class PiperBackend:
+    """Offline on-device speech synthesis using the piper CLI"""
+    
+    name = 'piper'
+    
+    def __init__(self, executable, model):
+        """
+        Initialize Piper backend
+        
+        Args:
+            executable (str): Path to the piper binary
+            model (str): Path to the .onnx voice model
+        """
+        self.executable = executable
+        self.model = model
+        
+        # Raw output is 16-bit mono PCM at the voice's sample rate
+        with open(f"{model}.json", 'r', encoding='utf-8') as f:
+            self.sample_rate = json.load(f)['audio']['sample_rate']
+    
+    @classmethod
+    def create(cls, model=PIPER_MODEL):
+        """Create the backend, or return None if piper or the voice is missing"""
+        executable = shutil.which('piper')
+        if not executable or not model:
+            return None
+        try:
+            return cls(executable, model)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Piper voice not usable: {e}")
+            return None
+    
+    def synthesize(self, text, slow=False):
+        """
+        Synthesize text to WAV bytes
+        
+        Args:
+            text (str): Text to synthesize
+            slow (bool): Whether to speak slowly
+            
+        Returns:
+            bytes: WAV audio data
+        """
+        cmd = [self.executable, '--model', self.model, '--output_raw']
+        if slow:
+            cmd += ['--length_scale', '1.5']
+        result = subprocess.run(cmd, input=text.encode('utf-8'),
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        
+        # Wrap the PCM in a WAV header so pygame can load it like any other clip
+        buf = BytesIO()
+        with wave.open(buf, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(result.stdout)
+        return buf.getvalue()
 
 
 class TTSManager:
-    """Manages text-to-speech functionality using Google TTS"""
+    """Manages text-to-speech functionality using Piper, falling back to Google TTS"""
     
     def __init__(self, language='en', slow=False):
         """
@@ -27,6 +110,24 @@ class TTSManager:
         self.slow = slow
         self.is_speaking = False
         
+        # Prefer offline synthesis when a Piper voice is installed
+        self.backend = PiperBackend.create()
+        if self.backend:
+            print(f"Using Piper TTS voice: {self.backend.model}")
+        
+        # Audio bytes keyed by (backend, text, language, slow), in LRU order;
+        # the speech worker and prewarm() both touch it
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Keys being synthesized right now, so concurrent callers wait for
+        # the first one instead of synthesizing (and writing) the same clip
+        self._inflight = {}
+        
+        # Set by stop() to end a playback wait early; the counter lets a
+        # speak_many() batch notice a stop between its lines
+        self._done = threading.Event()
+        self._stop_count = 0
+        
         # Initialize pygame mixer for audio playback
         try:
             pygame.mixer.init()
@@ -35,6 +136,13 @@ class TTSManager:
         except pygame.error as e:
             print(f"Warning: Audio system not available: {e}")
             self.audio_available = False
+        
+        # One worker plays queued speech in order, so callers never wait
+        self._queue = queue.Queue(maxsize=SPEECH_QUEUE_SIZE)
+        self._worker = None
+        if self.audio_available:
+            self._worker = threading.Thread(target=self._speech_worker, name="tts", daemon=True)
+            self._worker.start()
     
     def speak(self, text, blocking=False):
         """
@@ -43,24 +151,186 @@ class TTSManager:
         Args:
             text (str): Text to speak
             blocking (bool): If True, wait for speech to complete
+            
+        Returns:
+            Future: Resolved once the speech has played (or was dropped)
         """
         if not self.audio_available:
             print(f"TTS: {text}")  # Fallback to console output
-            return
+            return _completed_future()
             
         if not text or not text.strip():
-            return
+            return _completed_future()
+        
+        return self._enqueue(text, blocking)
+    
+    def speak_many(self, texts, blocking=False):
+        """
+        Speak several lines back to back as one queued item
+        
+        Args:
+            texts (list): Lines to speak in order
+            blocking (bool): If True, wait for all of them to complete
             
-        if self.is_speaking and not blocking:
-            return  # Skip if already speaking and non-blocking
+        Returns:
+            Future: Resolved once every line has played (or was dropped)
+        """
+        texts = tuple(text for text in texts if text and text.strip())
+        if not texts:
+            return _completed_future()
+        
+        if not self.audio_available:
+            for text in texts:
+                print(f"TTS: {text}")  # Fallback to console output
+            return _completed_future()
+        
+        return self._enqueue(texts, blocking)
+    
+    def play(self, sound, blocking=False):
+        """
+        Queue a pre-rendered Sound behind any pending speech
+        
+        Args:
+            sound (pygame.mixer.Sound): Clip from render()
+            blocking (bool): If True, wait for playback to complete
             
+        Returns:
+            Future: Resolved once the clip has played (or was dropped)
+        """
+        return self._enqueue(sound, blocking)
+    
+    def _enqueue(self, item, blocking):
+        """Hand text, a tuple of texts or a Sound to the speech worker"""
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            print(f"TTS queue full, dropping: {item}")
+            future.set_result(None)
+            return future
         if blocking:
-            self._speak_sync(text)
-        else:
-            # Speak asynchronously
-            thread = threading.Thread(target=self._speak_sync, args=(text,))
-            thread.daemon = True
-            thread.start()
+            future.exception()  # Wait without raising, like the old blocking speak
+        return future
+    
+    def _speech_worker(self):
+        """Play queued speech one item at a time until a None item arrives"""
+        while True:
+            item, future = self._queue.get()
+            if item is None:
+                break
+            try:
+                if isinstance(item, str):
+                    self._speak_sync(item)
+                elif isinstance(item, tuple):
+                    stop_count = self._stop_count
+                    for text in item:
+                        if self._stop_count != stop_count:
+                            break
+                        self._speak_sync(text)
+                else:
+                    self._play_sync(item)
+            except Exception as e:
+                print(f"TTS worker error: {e}")
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+    
+    def _cache_path(self, key):
+        """Get the on-disk cache file for a synthesis key"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(TTS_CACHE_DIR, f"{digest}.audio")
+    
+    def _synthesize(self, text):
+        """
+        Get audio bytes for text, synthesizing only on a cache miss
+        
+        Args:
+            text (str): Text to synthesize
+            
+        Returns:
+            bytes: WAV (Piper) or MP3 (gTTS) audio data
+        """
+        backend = self.backend
+        key = self._cache_key(text)
+        while True:
+            with self._cache_lock:
+                audio = self._cache.get(key)
+                if audio is not None:
+                    self._cache.move_to_end(key)
+                    return audio
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            # Another thread is producing this clip; use its result
+            pending.wait()
+        
+        try:
+            path = self._cache_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    audio = f.read()
+            except OSError:
+                if backend:
+                    audio = backend.synthesize(text, self.slow)
+                else:
+                    buf = BytesIO()
+                    gTTS(text=text, lang=self.language, slow=self.slow).write_to_fp(buf)
+                    audio = buf.getvalue()
+                self._persist(path, audio)
+            
+            with self._cache_lock:
+                self._cache[key] = audio
+                while len(self._cache) > TTS_MEMORY_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            return audio
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(key).set()
+    
+    def _cache_key(self, text):
+        """Key a clip by everything that changes how it sounds"""
+        backend = self.backend
+        return (backend.name if backend else 'gtts', text, self.language, self.slow)
+    
+    def _persist(self, path, audio):
+        """Write a clip to the disk cache atomically, so readers never see half a file"""
+        try:
+            os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=TTS_CACHE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(audio)
+                os.replace(tmp_path, path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Warning: Could not persist TTS cache: {e}")
+    
+    def prewarm(self, texts):
+        """
+        Synthesize texts into the cache in the background
+        
+        Args:
+            texts (iterable): Phrases the tutor is likely to speak
+        """
+        if not self.audio_available:
+            return
+        texts = [text for text in texts if text]
+        thread = threading.Thread(target=self._prewarm, args=(texts,), name="tts-prewarm", daemon=True)
+        thread.start()
+    
+    def _prewarm(self, texts):
+        """Synthesize each text so the first time it is spoken plays from memory"""
+        for text in texts:
+            # Already on disk: it loads quickly on first use, no need to fetch
+            if os.path.exists(self._cache_path(self._cache_key(text))):
+                continue
+            try:
+                self._synthesize(text)
+            except Exception as e:
+                print(f"Warning: Could not pre-synthesize '{text}': {e}")
     
     def _speak_sync(self, text):
         """
@@ -70,42 +340,52 @@ class TTSManager:
             text (str): Text to speak
         """
         try:
-            self.is_speaking = True
-            
-            # Create gTTS object
-            tts = gTTS(text=text, lang=self.language, slow=self.slow)
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-                tmp_filename = tmp_file.name
-                
-            tts.save(tmp_filename)
-            
-            # Play the audio file
-            pygame.mixer.music.load(tmp_filename)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to complete
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-                
+            # Play straight from memory, no temporary file
+            self._play_sync(pygame.mixer.Sound(BytesIO(self._synthesize(text))))
         except Exception as e:
             print(f"TTS Error: {e}")
             print(f"Fallback text: {text}")
+    
+    def _play_sync(self, sound):
+        """Play a Sound and wait until it finishes or stop() is called"""
+        try:
+            self.is_speaking = True
+            self._done.clear()
+            channel = sound.play()
             
+            # Sleep for the clip's length instead of polling get_busy();
+            # stop() wakes us early
+            if channel is not None:
+                self._done.wait(sound.get_length())
         finally:
             self.is_speaking = False
-            # Clean up temporary file
-            try:
-                if 'tmp_filename' in locals():
-                    os.unlink(tmp_filename)
-            except:
-                pass
+    
+    def render(self, text):
+        """
+        Synthesize text into a playable Sound
+        
+        Args:
+            text (str): Text to synthesize
+            
+        Returns:
+            pygame.mixer.Sound, or None if audio is not available
+        """
+        if not self.audio_available:
+            return None
+        return pygame.mixer.Sound(BytesIO(self._synthesize(text)))
     
     def stop(self):
-        """Stop current speech"""
+        """Stop current speech and drop anything still queued"""
+        while True:
+            try:
+                _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_result(None)
         if self.audio_available:
-            pygame.mixer.music.stop()
+            pygame.mixer.stop()
+        self._stop_count += 1
+        self._done.set()
         self.is_speaking = False
     
     def set_language(self, language):
@@ -129,16 +409,123 @@ class TTSManager:
     def cleanup(self):
         """Clean up resources"""
         self.stop()
+        if self._worker is not None:
+            self._queue.put((None, None))
+            self._worker.join(timeout=1)
+            self._worker = None
         if self.audio_available:
             pygame.mixer.quit()
 
 
+def _completed_future():
+    """Future for speech that finished (or never started) immediately"""
+    future = Future()
+    future.set_result(None)
+    return future
+
+
+class NullTTSManager:
+    """Silent TTSManager stand-in that records what would have been spoken"""
+    
+    def __init__(self, language='en', slow=False):
+        self.language = language
+        self.slow = slow
+        self.is_speaking = False
+        self.audio_available = False
+        self.spoken = []
+    
+    def speak(self, text, blocking=False):
+        """Record text instead of speaking it"""
+        if text and text.strip():
+            self.spoken.append(text)
+        return _completed_future()
+    
+    def speak_many(self, texts, blocking=False):
+        """Record several lines in order"""
+        for text in texts:
+            self.speak(text, blocking)
+        return _completed_future()
+    
+    def play(self, sound, blocking=False):
+        """Nothing is ever rendered, so there is nothing to play"""
+        return _completed_future()
+    
+    def render(self, text):
+        """No audio device: nothing to render"""
+        return None
+    
+    def prewarm(self, texts):
+        """No synthesis, so nothing to warm"""
+    
+    def stop(self):
+        """Nothing is playing"""
+    
+    def set_language(self, language):
+        self.language = language
+    
+    def set_slow_speech(self, slow):
+        self.slow = slow
+    
+    def cleanup(self):
+        """No resources to release"""
+
+
 # Braille-specific TTS messages
 class BrailleTTS:
     """Predefined messages for Braille Writing Tutor"""
     
+    # Fixed phrases, rendered once into Sounds so each prompt just plays
+    _PHRASES = {
+        'welcome': "Welcome to Braille Writing Tutor. Press any button to begin.",
+        'button_registered': "Pattern registered successfully.",
+        'pattern_erased': "Pattern erased.",
+        'no_pattern': "No pattern to read.",
+        'displaying_pattern': "Displaying current pattern.",
+        'error': "An error occurred.",
+        'shutdown': "Braille Writing Tutor shutting down. Goodbye!",
+    }
+    
     def __init__(self, tts_manager):
         self.tts = tts_manager
+        self._sounds = {}
+        self._sounds_lock = threading.Lock()
+        self._generation = 0  # Bumped per language, so a stale render is discarded
+        self._start_prerender()
+    
+    def _start_prerender(self):
+        """Render the fixed phrases in the background so startup never waits on synthesis"""
+        with self._sounds_lock:
+            self._generation += 1
+            self._sounds = {}
+            generation = self._generation
+        # Nothing can be rendered without a mixer (or with the silent manager)
+        if not getattr(self.tts, 'audio_available', False):
+            return
+        thread = threading.Thread(target=self._prerender, args=(generation,), daemon=True)
+        thread.start()
+    
+    def _prerender(self, generation):
+        """Render every fixed phrase into a Sound"""
+        sounds = {}
+        for key, text in self._PHRASES.items():
+            try:
+                sound = self.tts.render(text)
+            except Exception as e:
+                print(f"Warning: Could not pre-render '{key}' prompt: {e}")
+                continue
+            if sound is not None:
+                sounds[key] = sound
+        with self._sounds_lock:
+            # set_language() may have started a newer render meanwhile
+            if generation == self._generation:
+                self._sounds = sounds
+    
+    def _say(self, key):
+        """Play a fixed phrase, synthesizing on demand if it is not rendered yet"""
+        sound = self._sounds.get(key)
+        if sound is not None:
+            return self.tts.play(sound)
+        return self.tts.speak(self._PHRASES[key])
     
     def speak(self, text, blocking=False):
         """
@@ -148,7 +535,21 @@ class BrailleTTS:
             text (str): Text to speak
             blocking (bool): If True, wait for speech to complete
         """
-        self.tts.speak(text, blocking)
+        return self.tts.speak(text, blocking)
+    
+    def speak_many(self, texts, blocking=False):
+        """
+        Speak several lines back to back as one queued item
+        
+        Args:
+            texts (list): Lines to speak in order
+            blocking (bool): If True, wait for all of them to complete
+        """
+        return self.tts.speak_many(texts, blocking)
+    
+    def prewarm(self, texts):
+        """Synthesize phrases ahead of time so they play without delay"""
+        self.tts.prewarm(texts)
     
     def stop(self):
         """Stop current speech"""
@@ -157,65 +558,60 @@ class BrailleTTS:
     def set_language(self, language):
         """Set the TTS language"""
         self.tts.set_language(language)
+        # Rendered prompts belong to the old language
+        self._start_prerender()
     
     def welcome(self):
         """Welcome message"""
-        self.tts.speak("Welcome to Braille Writing Tutor. Press any button to begin.")
+        return self._say('welcome')
     
     def button_registered(self):
         """Button registration confirmation"""
-        self.tts.speak("Pattern registered successfully.")
+        return self._say('button_registered')
     
     def pattern_erased(self):
         """Pattern erase confirmation"""
-        self.tts.speak("Pattern erased.")
+        return self._say('pattern_erased')
     
     def reading_pattern(self, pattern_text=""):
         """Reading pattern announcement"""
         if pattern_text:
-            self.tts.speak(f"Reading pattern: {pattern_text}")
-        else:
-            self.tts.speak("No pattern to read.")
+            return self.tts.speak(f"Reading pattern: {pattern_text}")
+        return self._say('no_pattern')
     
     def displaying_pattern(self):
         """Display pattern announcement"""
-        self.tts.speak("Displaying current pattern.")
+        return self._say('displaying_pattern')
     
     def error_message(self, error=""):
         """Error message"""
-        message = f"Error: {error}" if error else "An error occurred."
-        self.tts.speak(message)
+        if error:
+            return self.tts.speak(f"Error: {error}")
+        return self._say('error')
     
     def shutdown_message(self):
         """Shutdown message"""
-        self.tts.speak("Braille Writing Tutor shutting down. Goodbye!")
-
-
-# Global TTS instance (singleton pattern)
-_tts_manager = None
-_braille_tts = None
+        return self._say('shutdown')
 
 
+# Global TTS instances (singleton pattern)
+@functools.cache
 def get_tts_manager():
     """Get global TTS manager instance"""
-    global _tts_manager
-    if _tts_manager is None:
-        _tts_manager = TTSManager()
-    return _tts_manager
+    if TTS_BACKEND == 'null':
+        return NullTTSManager()
+    return TTSManager()
 
 
+@functools.cache
 def get_braille_tts():
     """Get global Braille TTS instance"""
-    global _braille_tts
-    if _braille_tts is None:
-        _braille_tts = BrailleTTS(get_tts_manager())
-    return _braille_tts
+    return BrailleTTS(get_tts_manager())
 
 
 def cleanup_tts():
     """Cleanup TTS resources"""
-    global _tts_manager, _braille_tts
-    if _tts_manager:
-        _tts_manager.cleanup()
-        _tts_manager = None
-        _braille_tts = None
\ No newline at end of file
+    if get_tts_manager.cache_info().currsize:
+        get_tts_manager().cleanup()
+    get_tts_manager.cache_clear()
+    get_braille_tts.cache_clear()
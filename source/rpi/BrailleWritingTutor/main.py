@@ -3,9 +3,13 @@ Braille Writing Tutor - Main Application
 Integrates Phase Manager, Arduino Controller, and Enhanced Button Management
 """
 
-import time
+import os
+import concurrent.futures
+import logging
+import logging.handlers
+import queue
+import select
 import signal
-import sys
 import threading
 from gtts_config import get_braille_tts, cleanup_tts
 from phase_manager import get_phase_manager, cleanup_phase_manager, TutoringPhases
@@ -13,6 +17,10 @@ from arduino_controller import get_arduino_controller, cleanup_arduino_controlle
 from button_config import get_button_manager, cleanup_button_manager, cleanup_gpio_system
 
 
+# Longest shutdown waits for the goodbye message to finish playing
+SHUTDOWN_SPEECH_TIMEOUT = 5.0
+
+
 class BrailleWritingTutor:
     def __init__(self):
         """Initialize the Braille Writing Tutor system"""
@@ -24,6 +32,9 @@ class BrailleWritingTutor:
         # System state
         self.running = True
         self.initialization_complete = False
+        self._shutdown_evt = threading.Event()
+        self._signal_received = None
+        self._wakeup_r = self._wakeup_w = None
         
         # Initialize managers (order matters!)
         try:
@@ -33,6 +44,7 @@ class BrailleWritingTutor:
             
             # 2. Initialize Arduino controller
             self.arduino = get_arduino_controller()
+            self.arduino.register_callback('DISCONNECTED', self._on_arduino_disconnected)
             print("✓ Arduino controller initialized")
             
             # 3. Initialize phase manager (depends on TTS and Arduino)
@@ -41,9 +53,15 @@ class BrailleWritingTutor:
             
             # 4. Initialize button manager (depends on phase manager)
             self.button_manager = get_button_manager()
+            self.button_manager.bind_managers(self.phase_manager, self.tts)
             print("✓ Button manager initialized")
             
-            # 5. Setup signal handlers for clean shutdown
+            # 5. Setup signal handlers for clean shutdown; the interpreter
+            # writes to the wakeup pipe so the main loop's select() returns
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            os.set_blocking(self._wakeup_r, False)
+            os.set_blocking(self._wakeup_w, False)
+            signal.set_wakeup_fd(self._wakeup_w)
             signal.signal(signal.SIGINT, self.signal_handler)
             signal.signal(signal.SIGTERM, self.signal_handler)
             
@@ -56,9 +74,8 @@ class BrailleWritingTutor:
             raise
         
     def signal_handler(self, signum, frame):
-        """Handle shutdown signals gracefully"""
-        print(f"\nReceived signal {signum}. Shutting down gracefully...")
-        self.shutdown()
+        """Record the shutdown signal; the main loop does the actual shutdown"""
+        self._signal_received = signum
         
     def run(self):
         """Main application loop"""
@@ -102,13 +119,10 @@ class BrailleWritingTutor:
             # Initial system state
             self.phase_manager.set_phase(TutoringPhases.OFF)
             
-            # Play welcome message
+            # Play welcome message and initial instructions; speech is queued,
+            # so they play in order without waiting here
             self.tts.welcome()
-            time.sleep(2)
-            
-            # Announce initial instructions
             self.tts.speak("Maligayang pagdating sa Braille Writing Tutor!")
-            time.sleep(1)
             self.tts.speak("I-rotate ang knob para pumili ng phase. Nagsisimula tayo sa Phase 0 - sistema nakasara.")
             
             # Main application loop
@@ -121,25 +135,34 @@ class BrailleWritingTutor:
     
     def _main_loop(self):
         """Main application loop with system monitoring"""
-        last_status_check = time.time()
         status_interval = 30  # Check system status every 30 seconds
         
-        while self.running:
-            current_time = time.time()
-            
-            # Periodic system status check
-            if current_time - last_status_check > status_interval:
-                self._check_system_status()
-                last_status_check = current_time
-            
-            # Check for Arduino connection
-            if self.arduino and not self.arduino.is_connected():
-                # Only show warning once every 30 seconds to avoid spam
-                if current_time - last_status_check > 25:  # Show 5s before status check
-                    print("Warning: Arduino not connected (running in test mode)")
-            
-            # Small delay to prevent excessive CPU usage
-            time.sleep(0.1)
+        # Sleep until a signal arrives on the wakeup pipe, waking only for the
+        # status check; the Arduino controller reports a lost connection itself
+        while self._signal_received is None:
+            readable, _, _ = select.select([self._wakeup_r], [], [], status_interval)
+            if readable:
+                try:
+                    os.read(self._wakeup_r, 512)
+                except BlockingIOError:
+                    pass
+                continue
+            self._check_system_status()
+        
+        print(f"\nReceived signal {self._signal_received}. Shutting down gracefully...")
+    
+    def _close_wakeup_pipe(self):
+        """Detach and close the signal wakeup pipe"""
+        if self._wakeup_w is not None:
+            signal.set_wakeup_fd(-1)
+        for fd in (self._wakeup_r, self._wakeup_w):
+            if fd is not None:
+                os.close(fd)
+        self._wakeup_r = self._wakeup_w = None
+    
+    def _on_arduino_disconnected(self):
+        """Called from the Arduino reader thread when the serial link drops"""
+        print("Warning: Arduino not connected (running in test mode)")
     
     def _check_system_status(self):
         """Periodic system status check"""
@@ -147,8 +170,13 @@ class BrailleWritingTutor:
             current_phase = self.phase_manager.get_current_phase()
             knob_position = self.button_manager.get_knob_position()
             arduino_connected = self.arduino.is_connected()
+            # One GPIO bank read covers every button; one held for a whole
+            # status interval is likely stuck
+            held = [name for name, pressed in self.button_manager.get_pressed_buttons().items() if pressed]
             
             print(f"Status - Phase: {current_phase}, Knob: {knob_position}, Arduino: {'✓' if arduino_connected else '✗'}")
+            if held:
+                print(f"Warning: buttons held down: {', '.join(held)}")
             
             # Sync knob position with phase if they're out of sync
             if knob_position != current_phase:
@@ -160,6 +188,9 @@ class BrailleWritingTutor:
     
     def shutdown(self):
         """Clean shutdown of the application"""
+        if self._shutdown_evt.is_set():
+            return  # Already shut down
+        self._shutdown_evt.set()
         print("\nInitiating system shutdown...")
         
         try:
@@ -169,8 +200,10 @@ class BrailleWritingTutor:
             
             # Play shutdown message
             if hasattr(self, 'tts') and self.tts:
-                self.tts.shutdown_message()
-                time.sleep(2)  # Give time for audio to play
+                try:
+                    self.tts.shutdown_message().result(timeout=SHUTDOWN_SPEECH_TIMEOUT)
+                except concurrent.futures.TimeoutError:
+                    print("Shutdown message still playing; continuing shutdown")
             
             self.running = False
             
@@ -187,16 +220,42 @@ class BrailleWritingTutor:
             cleanup_tts()
             print("✓ TTS system cleaned up")
             
+            self._close_wakeup_pipe()
+            
             print("✓ System shutdown complete")
             
         except Exception as e:
             print(f"Error during shutdown: {e}")
-        
-        sys.exit(0)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue log records without ever blocking; drop them if the writer falls behind"""
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def setup_logging(max_pending: int = 1024) -> logging.handlers.QueueListener:
+    """Route log output through a background writer so event threads never wait on stdout"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    
+    log_queue = queue.Queue(maxsize=max_pending)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(_DroppingQueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
 
 
 def main():
     """Main entry point"""
+    log_listener = setup_logging()
     try:
         print("Starting Braille Writing Tutor...")
         tutor = BrailleWritingTutor()
@@ -208,6 +267,8 @@ def main():
         print(f"Failed to start application: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        log_listener.stop()
 
 
 if __name__ == '__main__':
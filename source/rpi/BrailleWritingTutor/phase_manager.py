@@ -3,13 +3,18 @@ Phase Management for Braille Writing Tutor
 Handles the 6 tutoring phases and their specific logic
 """
 
-import time
+import functools
 import threading
-from typing import Dict, List, Optional
+import logging
+from enum import IntEnum
+from typing import Optional
 from gtts_config import get_braille_tts
 
 
-class TutoringPhases:
+log = logging.getLogger("braille.phases")
+
+
+class TutoringPhases(IntEnum):
     """Enumeration of tutoring phases"""
     OFF = 0
     EMBOSSING = 1
@@ -20,13 +25,76 @@ class TutoringPhases:
     FREEHAND = 6
 
 
+# Spoken welcome, spoken instructions and display text (None clears the
+# display) announced when entering each active phase
+PHASE_INTROS = {
+    TutoringPhases.EMBOSSING: (
+        "Maligayang pagdating sa Phase 1: Pag-aaral ng basic Braille dots",
+        "Mag-practice tayo ng mga tuldok. Pindutin ang stylus sa writing slate.",
+        "DOTS"),
+    TutoringPhases.CHARACTER_ID: (
+        "Maligayang pagdating sa Phase 2: Pag-aaral ng mga titik at numero",
+        "Matutuhan natin ang mga letra, numero, at punctuation marks.",
+        "ABC"),
+    TutoringPhases.MORPHOLOGY: (
+        "Maligayang pagdating sa Phase 3: Pag-aaral ng mga salita",
+        "Matutuhan natin kung paano bumuo ng mga salita gamit ang Braille.",
+        None),
+    TutoringPhases.SENTENCE: (
+        "Maligayang pagdating sa Phase 4: Pag-aaral ng mga pangungusap",
+        "Matutuhan natin kung paano sumulat ng buong pangungusap.",
+        None),
+    TutoringPhases.GAMIFICATION: (
+        "Maligayang pagdating sa Phase 5: Larong pang-edukasyon",
+        "Maglaro tayo! Pakinggan ang tunog ng hayop at isulat ang pangalan.",
+        "GAME"),
+    TutoringPhases.FREEHAND: (
+        "Maligayang pagdating sa Phase 6: Libreng pagsusulat",
+        "Sumulat ng kahit ano. Babasahin ko ang inyong sinulat.",
+        None),
+}
+
+# Cell bit for each dot number (index 0 unused; dots are 1-6)
+DOT_PATTERNS = (0,) + tuple(1 << i for i in range(6))
+
+# Embossing feedback for each dot number, built once instead of per press
+DOT_PRESSED_MESSAGES = tuple(f"Napindot ninyo ang tuldok numero {dot}" for dot in range(7))
+
+# Dot-detection announcement for every cell (0-9, matching the Arduino's
+# NUM_BRAILLE_CELLS) and dot number (index 0 unused; dots are 1-6)
+DOT_DETECTED_MESSAGES = tuple(
+    tuple(f"Tuldok numero {dot} sa cell {cell + 1}" for dot in range(7))
+    for cell in range(10)
+)
+
+# Confirmation spoken by the register button in each active phase
+REGISTER_CONFIRMATIONS = {
+    TutoringPhases.EMBOSSING: "Na-register ang pattern. Tama ito.",
+    TutoringPhases.CHARACTER_ID: "Na-register ang titik.",
+    TutoringPhases.MORPHOLOGY: "Na-register ang salita.",
+    TutoringPhases.SENTENCE: "Na-register ang pangungusap.",
+    TutoringPhases.GAMIFICATION: "Na-register ang sagot.",
+    TutoringPhases.FREEHAND: "Na-register ang teksto.",
+}
+
+
+def _signals_input_handled(handler):
+    """Set the manager's input_handled event once a button handler returns"""
+    @functools.wraps(handler)
+    def wrapper(self):
+        try:
+            return handler(self)
+        finally:
+            self.input_handled.set()
+    return wrapper
+
+
 class PhaseManager:
     """Manages tutoring phases and their specific behaviors"""
     
     def __init__(self):
         self.current_phase = TutoringPhases.OFF
         self._arduino = None  # Lazy loaded to avoid circular imports
-        self._tts = None      # Lazy loaded
         
         # Phase-specific state
         self.current_input = ""
@@ -45,8 +113,73 @@ class PhaseManager:
         self.game_attempts = 0
         self.current_animal = None
         
+        # Set whenever a button handler finishes; handlers run on the button
+        # manager's worker threads, so clear it before a press to await one
+        self.input_handled = threading.Event()
+        
+        # Per-phase dispatch tables, built once
+        self._input_resetters = {
+            TutoringPhases.CHARACTER_ID: self.stored_patterns.clear,
+            TutoringPhases.MORPHOLOGY: self._clear_word,
+            TutoringPhases.SENTENCE: self._clear_sentence,
+        }
+        self._exit_handlers = {
+            **self._input_resetters,
+            TutoringPhases.EMBOSSING: self._clear_arduino_display,
+            TutoringPhases.GAMIFICATION: self._end_game,
+            TutoringPhases.FREEHAND: self._clear_arduino_display,
+        }
+        self._enter_handlers = {
+            TutoringPhases.OFF: self._enter_off,
+            TutoringPhases.EMBOSSING: self._enter_embossing,
+            TutoringPhases.CHARACTER_ID: self.stored_patterns.clear,
+            TutoringPhases.MORPHOLOGY: self._clear_word,
+            TutoringPhases.SENTENCE: self._clear_sentence,
+            TutoringPhases.GAMIFICATION: self._start_game,
+        }
+        # Phases are dense ints 0-6, so slate input indexes a tuple directly
+        self._slate_table = (
+            None,                           # OFF
+            self._handle_embossing_input,   # EMBOSSING
+            self._handle_character_input,   # CHARACTER_ID
+            self._handle_word_input,        # MORPHOLOGY
+            self._handle_sentence_input,    # SENTENCE
+            self._handle_game_input,        # GAMIFICATION
+            self._handle_freehand_input,    # FREEHAND
+        )
+        self._read_handlers = {
+            TutoringPhases.EMBOSSING: self._read_embossing,
+            TutoringPhases.CHARACTER_ID: self._read_characters,
+            TutoringPhases.MORPHOLOGY: self._read_word,
+            TutoringPhases.SENTENCE: self._read_sentence,
+            TutoringPhases.GAMIFICATION: self._read_score,
+            TutoringPhases.FREEHAND: self._read_freehand,
+        }
+        
+        # Resolve collaborators once; event handlers use these attributes directly
+        try:
+            self.arduino = self._get_arduino()
+            self.tts = get_braille_tts()  # Shared process-wide instance
+        except Exception as e:
+            print(f"Error resolving phase manager dependencies: {e}")
+        
         # Register Arduino callbacks
         self._setup_arduino_callbacks()
+        
+        # Synthesize the phase introductions now so starting a phase replays
+        # cached audio; other prompts are cached to disk the first time
+        try:
+            self.tts.prewarm(self._startup_utterances())
+        except Exception as e:
+            print(f"Error pre-synthesizing phase prompts: {e}")
+    
+    @staticmethod
+    def _startup_utterances():
+        """List the phase introductions, the first prompts the tutor speaks"""
+        texts = []
+        for welcome, instructions, _ in PHASE_INTROS.values():
+            texts += (welcome, instructions)
+        return texts
     
     def _get_arduino(self):
         """Lazy load Arduino controller to avoid circular imports"""
@@ -55,19 +188,14 @@ class PhaseManager:
             self._arduino = get_arduino_controller()
         return self._arduino
     
-    def _get_tts(self):
-        """Lazy load TTS manager"""
-        if self._tts is None:
-            self._tts = get_braille_tts()
-        return self._tts
-    
     def _setup_arduino_callbacks(self):
         """Setup callbacks for Arduino messages"""
         try:
-            arduino = self._get_arduino()
-            arduino.register_callback('BUTTON_PRESS', self._handle_slate_button_press)
-            arduino.register_callback('BUTTON_RELEASE', self._handle_slate_button_release)
-            arduino.register_callback('DOT_PRESSED', self._handle_dot_press)
+            self.arduino.register_callbacks({
+                'BUTTON_PRESS': self._handle_slate_button_press,
+                'BUTTON_RELEASE': self._handle_slate_button_release,
+                'DOT_PRESSED': self._handle_dot_press,
+            })
         except Exception as e:
             print(f"Error setting up Arduino callbacks: {e}")
     
@@ -93,137 +221,76 @@ class PhaseManager:
         
         # Update Arduino
         try:
-            arduino = self._get_arduino()
-            arduino.set_phase(phase)
+            self.arduino.set_phase(phase)
         except Exception as e:
             print(f"Error updating Arduino phase: {e}")
     
     def _exit_phase(self, phase: int):
         """Clean up when exiting a phase"""
-        if phase == TutoringPhases.OFF:
-            pass
-        elif phase == TutoringPhases.EMBOSSING:
-            try:
-                arduino = self._get_arduino()
-                arduino.clear_display()
-            except:
-                pass
-        elif phase == TutoringPhases.CHARACTER_ID:
-            self.stored_patterns.clear()
-        elif phase == TutoringPhases.MORPHOLOGY:
-            self.current_word = ""
-        elif phase == TutoringPhases.SENTENCE:
-            self.current_sentence = ""
-        elif phase == TutoringPhases.GAMIFICATION:
-            self._end_game()
-        elif phase == TutoringPhases.FREEHAND:
-            try:
-                arduino = self._get_arduino()
-                arduino.clear_display()
-            except:
-                pass
+        handler = self._exit_handlers.get(phase)
+        if handler:
+            handler()
     
     def _enter_phase(self, phase: int):
         """Initialize when entering a phase"""
         self.waiting_for_input = False
-        tts = self._get_tts()
         
-        if phase == TutoringPhases.OFF:
-            tts.speak("Sistema nakasara na. Salamat sa paggamit ng Braille Writing Tutor.")
-            try:
-                arduino = self._get_arduino()
-                arduino.disable_display()
-            except:
-                pass
-            
-        elif phase == TutoringPhases.EMBOSSING:
-            tts.speak("Maligayang pagdating sa Phase 1: Pag-aaral ng basic Braille dots")
-            time.sleep(1)
-            tts.speak("Mag-practice tayo ng mga tuldok. Pindutin ang stylus sa writing slate.")
-            try:
-                arduino = self._get_arduino()
-                arduino.enable_display()
-                arduino.display_text("DOTS")
-            except:
-                pass
-            self.waiting_for_input = True
-            
-        elif phase == TutoringPhases.CHARACTER_ID:
-            tts.speak("Maligayang pagdating sa Phase 2: Pag-aaral ng mga titik at numero")
-            time.sleep(1)
-            tts.speak("Matutuhan natin ang mga letra, numero, at punctuation marks.")
-            try:
-                arduino = self._get_arduino()
-                arduino.enable_display()
-                arduino.display_text("ABC")
-            except:
-                pass
-            self.stored_patterns.clear()
-            
-        elif phase == TutoringPhases.MORPHOLOGY:
-            tts.speak("Maligayang pagdating sa Phase 3: Pag-aaral ng mga salita")
-            time.sleep(1)
-            tts.speak("Matutuhan natin kung paano bumuo ng mga salita gamit ang Braille.")
-            try:
-                arduino = self._get_arduino()
-                arduino.enable_display()
-                arduino.clear_display()
-            except:
-                pass
-            self.current_word = ""
-            
-        elif phase == TutoringPhases.SENTENCE:
-            tts.speak("Maligayang pagdating sa Phase 4: Pag-aaral ng mga pangungusap")
-            time.sleep(1)
-            tts.speak("Matutuhan natin kung paano sumulat ng buong pangungusap.")
-            try:
-                arduino = self._get_arduino()
-                arduino.enable_display()
-                arduino.clear_display()
-            except:
-                pass
-            self.current_sentence = ""
-            
-        elif phase == TutoringPhases.GAMIFICATION:
-            tts.speak("Maligayang pagdating sa Phase 5: Larong pang-edukasyon")
-            time.sleep(1)
-            tts.speak("Maglaro tayo! Pakinggan ang tunog ng hayop at isulat ang pangalan.")
-            try:
-                arduino = self._get_arduino()
-                arduino.enable_display()
-                arduino.display_text("GAME")
-            except:
-                pass
-            self._start_game()
-            
-        elif phase == TutoringPhases.FREEHAND:
-            tts.speak("Maligayang pagdating sa Phase 6: Libreng pagsusulat")
-            time.sleep(1)
-            tts.speak("Sumulat ng kahit ano. Babasahin ko ang inyong sinulat.")
-            try:
-                arduino = self._get_arduino()
-                arduino.enable_display()
-                arduino.clear_display()
-            except:
-                pass
+        intro = PHASE_INTROS.get(phase)
+        if intro:
+            self._announce_phase(*intro)
+        
+        handler = self._enter_handlers.get(phase)
+        if handler:
+            handler()
+    
+    def _announce_phase(self, welcome: str, instructions: str, display_text: Optional[str]):
+        """Speak a phase introduction and prepare the mechanical display"""
+        # One queued item plays both lines back to back without blocking
+        self.tts.speak_many((welcome, instructions))
+        try:
+            self.arduino.enable_display()
+            if display_text:
+                self.arduino.display_text(display_text)
+            else:
+                self.arduino.clear_display()
+        except:
+            pass
+    
+    def _enter_off(self):
+        """Announce shutdown and turn off the display"""
+        self.tts.speak("Sistema nakasara na. Salamat sa paggamit ng Braille Writing Tutor.")
+        try:
+            self.arduino.disable_display()
+        except:
+            pass
+    
+    def _enter_embossing(self):
+        """Start accepting dot practice from the slate"""
+        self.waiting_for_input = True
+    
+    def _clear_arduino_display(self):
+        """Clear the mechanical display, ignoring a missing Arduino"""
+        try:
+            self.arduino.clear_display()
+        except:
+            pass
+    
+    def _clear_word(self):
+        """Discard the word being built"""
+        self.current_word = ""
+    
+    def _clear_sentence(self):
+        """Discard the sentence being built"""
+        self.current_sentence = ""
     
     def _handle_slate_button_press(self, row: int, col: int, cell: int, dot: int):
         """Handle button press from writing slate"""
         if not self.waiting_for_input:
             return
-            
-        if self.current_phase == TutoringPhases.EMBOSSING:
-            self._handle_embossing_input(cell, dot)
-        elif self.current_phase == TutoringPhases.CHARACTER_ID:
-            self._handle_character_input(cell, dot)
-        elif self.current_phase == TutoringPhases.MORPHOLOGY:
-            self._handle_word_input(cell, dot)
-        elif self.current_phase == TutoringPhases.SENTENCE:
-            self._handle_sentence_input(cell, dot)
-        elif self.current_phase == TutoringPhases.GAMIFICATION:
-            self._handle_game_input(cell, dot)
-        elif self.current_phase == TutoringPhases.FREEHAND:
-            self._handle_freehand_input(cell, dot)
+        
+        handler = self._slate_table[self.current_phase]
+        if handler:
+            handler(cell, dot)
     
     def _handle_slate_button_release(self, row: int, col: int, cell: int, dot: int):
         """Handle button release from writing slate"""
@@ -233,87 +300,66 @@ class PhaseManager:
     def _handle_dot_press(self, cell: int, dot: int):
         """Handle dot press detection (from Arduino)"""
         if self.current_phase == TutoringPhases.EMBOSSING:
-            tts = self._get_tts()
-            tts.speak(f"Tuldok numero {dot} sa cell {cell + 1}")
+            if 0 <= cell < len(DOT_DETECTED_MESSAGES) and 0 < dot <= 6:
+                self.tts.speak(DOT_DETECTED_MESSAGES[cell][dot])
+            else:
+                self.tts.speak(f"Tuldok numero {dot} sa cell {cell + 1}")
     
     # Phase-specific input handlers
     def _handle_embossing_input(self, cell: int, dot: int):
         """Handle input in embossing phase"""
-        if dot > 0:  # Valid dot (1-6)
-            tts = self._get_tts()
-            tts.speak(f"Napindot ninyo ang tuldok numero {dot}")
+        if 0 < dot <= 6:  # Valid dot (1-6)
+            self.tts.speak(DOT_PRESSED_MESSAGES[dot])
             # Show the dot on display
-            pattern = 1 << (dot - 1)
+            pattern = DOT_PATTERNS[dot]
             try:
-                arduino = self._get_arduino()
-                arduino.send_command(f"SET_CELL:{cell},{pattern}")
+                self.arduino.set_cell(cell, pattern)
             except:
                 pass
     
     def _handle_character_input(self, cell: int, dot: int):
         """Handle input in character identification phase"""
         if dot > 0:
-            print(f"Character phase: Cell {cell}, Dot {dot}")
+            log.info("Character phase: Cell %d, Dot %d", cell, dot)
             # Build pattern for this cell
             # This would integrate with actual pattern recognition
     
     def _handle_word_input(self, cell: int, dot: int):
         """Handle input in morphology (word) phase"""
         if dot > 0:
-            print(f"Word phase: Cell {cell}, Dot {dot}")
+            log.info("Word phase: Cell %d, Dot %d", cell, dot)
             # Build words across multiple cells
     
     def _handle_sentence_input(self, cell: int, dot: int):
         """Handle input in sentence phase"""
         if dot > 0:
-            print(f"Sentence phase: Cell {cell}, Dot {dot}")
+            log.info("Sentence phase: Cell %d, Dot %d", cell, dot)
             # Build sentences with proper spacing
     
     def _handle_game_input(self, cell: int, dot: int):
         """Handle input in gamification phase"""
         if dot > 0:
-            print(f"Game phase: Cell {cell}, Dot {dot}")
+            log.info("Game phase: Cell %d, Dot %d", cell, dot)
             # Handle game-specific input
     
     def _handle_freehand_input(self, cell: int, dot: int):
         """Handle input in freehand phase"""
         if dot > 0:
-            print(f"Freehand phase: Cell {cell}, Dot {dot}")
+            log.info("Freehand phase: Cell %d, Dot %d", cell, dot)
             # Just echo whatever they write
     
     # Button action handlers (called from button_config.py)
+    @_signals_input_handled
     def handle_register_button(self):
         """Handle register button press"""
-        tts = self._get_tts()
-        
-        if self.current_phase == TutoringPhases.OFF:
-            tts.speak("Buksan muna ang sistema gamit ang knob.")
+        confirmation = REGISTER_CONFIRMATIONS.get(self.current_phase)
+        if confirmation is None:
+            self.tts.speak("Buksan muna ang sistema gamit ang knob.")
             return
-            
-        if self.current_phase == TutoringPhases.EMBOSSING:
-            tts.speak("Na-register ang pattern. Tama ito.")
-            tts.registered()
-            
-        elif self.current_phase == TutoringPhases.CHARACTER_ID:
-            tts.speak("Na-register ang titik.")
-            tts.registered()
-            
-        elif self.current_phase == TutoringPhases.MORPHOLOGY:
-            tts.speak("Na-register ang salita.")
-            tts.registered()
-            
-        elif self.current_phase == TutoringPhases.SENTENCE:
-            tts.speak("Na-register ang pangungusap.")
-            tts.registered()
-            
-        elif self.current_phase == TutoringPhases.GAMIFICATION:
-            self.tts.speak("Na-register ang sagot.")
-            # Check game answer
-            
-        elif self.current_phase == TutoringPhases.FREEHAND:
-            self.tts.speak("Na-register ang teksto.")
-            # Just acknowledge the input
+        
+        self.tts.speak(confirmation)
     
+    @_signals_input_handled
     def handle_erase_button(self):
         """Handle erase button press"""
         if self.current_phase == TutoringPhases.OFF:
@@ -323,46 +369,52 @@ class PhaseManager:
         self.arduino.clear_display()
         
         # Clear phase-specific data
-        if self.current_phase == TutoringPhases.CHARACTER_ID:
-            self.stored_patterns.clear()
-        elif self.current_phase == TutoringPhases.MORPHOLOGY:
-            self.current_word = ""
-        elif self.current_phase == TutoringPhases.SENTENCE:
-            self.current_sentence = ""
+        resetter = self._input_resetters.get(self.current_phase)
+        if resetter:
+            resetter()
     
+    @_signals_input_handled
     def handle_read_button(self):
         """Handle read button press"""
-        if self.current_phase == TutoringPhases.OFF:
-            return
-            
-        if self.current_phase == TutoringPhases.EMBOSSING:
-            self.tts.speak("Ang kasalukuyang pattern ay para sa pag-practice ng mga tuldok.")
-            
-        elif self.current_phase == TutoringPhases.CHARACTER_ID:
-            if self.stored_patterns:
-                self.tts.speak("Babasahin ko ang mga naka-store na titik.")
-                # Read back stored characters
-            else:
-                self.tts.speak("Walang naka-store na titik.")
-                
-        elif self.current_phase == TutoringPhases.MORPHOLOGY:
-            if self.current_word:
-                self.tts.speak(f"Ang kasalukuyang salita ay: {self.current_word}")
-            else:
-                self.tts.speak("Walang naka-type na salita.")
-                
-        elif self.current_phase == TutoringPhases.SENTENCE:
-            if self.current_sentence:
-                self.tts.speak(f"Ang kasalukuyang pangungusap ay: {self.current_sentence}")
-            else:
-                self.tts.speak("Walang naka-type na pangungusap.")
-                
-        elif self.current_phase == TutoringPhases.GAMIFICATION:
-            self.tts.speak(f"Ang inyong score ay {self.game_score}.")
-            
-        elif self.current_phase == TutoringPhases.FREEHAND:
-            self.tts.speak("Babasahin ko ang lahat ng naisulat ninyo.")
+        handler = self._read_handlers.get(self.current_phase)
+        if handler:
+            handler()
+    
+    def _read_embossing(self):
+        """Describe the dot practice pattern"""
+        self.tts.speak("Ang kasalukuyang pattern ay para sa pag-practice ng mga tuldok.")
+    
+    def _read_characters(self):
+        """Read back the stored characters"""
+        if self.stored_patterns:
+            self.tts.speak("Babasahin ko ang mga naka-store na titik.")
+            # Read back stored characters
+        else:
+            self.tts.speak("Walang naka-store na titik.")
+    
+    def _read_word(self):
+        """Read back the current word"""
+        if self.current_word:
+            self.tts.speak(f"Ang kasalukuyang salita ay: {self.current_word}")
+        else:
+            self.tts.speak("Walang naka-type na salita.")
     
+    def _read_sentence(self):
+        """Read back the current sentence"""
+        if self.current_sentence:
+            self.tts.speak(f"Ang kasalukuyang pangungusap ay: {self.current_sentence}")
+        else:
+            self.tts.speak("Walang naka-type na pangungusap.")
+    
+    def _read_score(self):
+        """Read the game score"""
+        self.tts.speak(f"Ang inyong score ay {self.game_score}.")
+    
+    def _read_freehand(self):
+        """Read back everything written"""
+        self.tts.speak("Babasahin ko ang lahat ng naisulat ninyo.")
+    
+    @_signals_input_handled
     def handle_display_button(self):
         """Handle display button press"""
         if self.current_phase == TutoringPhases.OFF:
@@ -386,10 +438,6 @@ class PhaseManager:
         self.game_score = 0
         self.game_attempts = 0
     
-    def get_current_phase(self) -> int:
-        """Get current phase number"""
-        return self.current_phase
-    
     def is_waiting_for_input(self) -> bool:
         """Check if system is waiting for user input"""
         return self.waiting_for_input
@@ -402,6 +450,10 @@ _phase_manager_lock = threading.Lock()
 def get_phase_manager() -> PhaseManager:
     """Get the singleton phase manager instance"""
     global _phase_manager_instance
+    # Fast path: reading the global is atomic, so only creation needs the lock
+    instance = _phase_manager_instance
+    if instance is not None:
+        return instance
     with _phase_manager_lock:
         if _phase_manager_instance is None:
             _phase_manager_instance = PhaseManager()
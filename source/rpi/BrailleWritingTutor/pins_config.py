@@ -3,6 +3,9 @@ Pin Configuration for Braille Writing Tutor
 This file defines all GPIO pin assignments for the Raspberry Pi
 """
 
+import functools
+from types import MappingProxyType
+
 # Button GPIO Pins (BCM numbering)
 BUTTON_PINS = {
     'REGISTER': 18,   # GPIO 18 - Register button
@@ -62,19 +65,34 @@ PWM_PINS = {
 # Interrupt-capable pins (for high-priority inputs)
 INTERRUPT_PINS = [2, 3, 4, 17, 27, 22, 10, 9, 11, 5, 6, 13, 19, 26]
 
+# The pin tables are fixed once the module loads, so the checks below can be cached
+BUTTON_PINS = MappingProxyType(BUTTON_PINS)
+KNOB_PINS = MappingProxyType(KNOB_PINS)
+LED_PINS = MappingProxyType(LED_PINS)
+SERIAL_PINS = MappingProxyType(SERIAL_PINS)
+I2C_PINS = MappingProxyType(I2C_PINS)
+SPI_PINS = MappingProxyType(SPI_PINS)
+PWM_PINS = MappingProxyType(PWM_PINS)
+INTERRUPT_PINS = tuple(INTERRUPT_PINS)
+
 # All configured pins for reference and validation
-ALL_CONFIGURED_PINS = {
+ALL_CONFIGURED_PINS = MappingProxyType({
     **BUTTON_PINS,
     **KNOB_PINS,
     **LED_PINS,
     **SERIAL_PINS,
     **I2C_PINS,
     **SPI_PINS
-}
+})
+
+# GPIO numbers of every configured pin, for membership checks
+ALL_CONFIGURED_PINS_SET = frozenset(ALL_CONFIGURED_PINS.values())
 
+@functools.lru_cache(maxsize=1)
 def validate_pin_configuration():
-    """Validate that no pins are double-assigned"""
-    used_pins = []
+    """Validate that no pins are double-assigned (checked once, then cached)"""
+    used_pins = set()
+    pin_count = 0
     conflicts = []
     
     for category, pins in [
@@ -88,7 +106,8 @@ def validate_pin_configuration():
         for name, pin in pins.items():
             if pin in used_pins:
                 conflicts.append(f"Pin {pin} used in both {category} and previous category")
-            used_pins.append(pin)
+            used_pins.add(pin)
+            pin_count += 1
     
     if conflicts:
         print("Pin configuration conflicts found:")
@@ -96,18 +115,17 @@ def validate_pin_configuration():
             print(f"  - {conflict}")
         return False
     else:
-        print(f"Pin configuration validated: {len(used_pins)} pins configured")
+        print(f"Pin configuration validated: {pin_count} pins configured")
         return True
 
+@functools.lru_cache(maxsize=1)
 def get_available_pins():
-    """Get list of available GPIO pins not currently configured"""
-    all_gpio_pins = list(range(2, 28))  # GPIO 2-27 are available on RPi
-    used_pins = list(ALL_CONFIGURED_PINS.values())
-    available = [pin for pin in all_gpio_pins if pin not in used_pins]
-    return available
+    """Get the GPIO pins not currently configured, as a tuple"""
+    all_gpio_pins = range(2, 28)  # GPIO 2-27 are available on RPi
+    return tuple(pin for pin in all_gpio_pins if pin not in ALL_CONFIGURED_PINS_SET)
 
 # Pin configuration metadata
-PIN_DESCRIPTIONS = {
+PIN_DESCRIPTIONS = MappingProxyType({
     18: "Register button / PWM0",
     19: "Erase button / PWM1", 
     20: "Read button",
@@ -130,4 +148,4 @@ PIN_DESCRIPTIONS = {
     11: "SPI SCLK",
     8: "SPI CE0",
     7: "SPI CE1"
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -3,325 +3,148 @@ Comprehensive Test Suite for Braille Writing Tutor
 Tests all major components and phase functionality
 """
 
-import time
 import sys
 import os
 
+import pytest
+
 # Add the current directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def test_imports():
-    """Test that all required modules can be imported"""
-    print("Testing module imports...")
-    
-    try:
-        from gtts_config import get_braille_tts, cleanup_tts, BrailleTTS
-        print("✓ TTS module imported successfully")
-    except Exception as e:
-        print(f"✗ TTS module import failed: {e}")
-        return False
-    
-    try:
-        from phase_manager import get_phase_manager, cleanup_phase_manager, TutoringPhases, PhaseManager
-        print("✓ Phase manager module imported successfully")
-    except Exception as e:
-        print(f"✗ Phase manager module import failed: {e}")
-        return False
-    
-    try:
-        from arduino_controller import get_arduino_controller, cleanup_arduino_controller, ArduinoController
-        print("✓ Arduino controller module imported successfully")
-    except Exception as e:
-        print(f"✗ Arduino controller module import failed: {e}")
-        return False
-    
-    try:
-        from button_config import get_button_manager, cleanup_button_manager, EnhancedButtonManager
-        print("✓ Button manager module imported successfully")
-    except Exception as e:
-        print(f"✗ Button manager module import failed: {e}")
-        return False
-    
-    try:
-        from pins_config import BUTTON_PINS, KNOB_PINS, LED_PINS, validate_pin_configuration
-        print("✓ Pin configuration module imported successfully")
-    except Exception as e:
-        print(f"✗ Pin configuration module import failed: {e}")
-        return False
-    
-    return True
+# Each BrailleTTS prompt, with its arguments and the text it should speak,
+# is checked as its own test
+TTS_PROMPTS = [
+    ('welcome', (), "Welcome to Braille Writing Tutor. Press any button to begin."),
+    ('speak', ("Test message sa TTS system",), "Test message sa TTS system"),
+    ('button_registered', (), "Pattern registered successfully."),
+    ('pattern_erased', (), "Pattern erased."),
+    ('reading_pattern', ("Sample pattern",), "Reading pattern: Sample pattern"),
+    ('reading_pattern', (), "No pattern to read."),
+    ('displaying_pattern', (), "Displaying current pattern."),
+]
+
+# Names each module must provide; the modules themselves are imported
+# once per session by the mocked_modules fixture
+EXPECTED_EXPORTS = {
+    'gtts_config': ('get_braille_tts', 'cleanup_tts', 'BrailleTTS'),
+    'phase_manager': ('get_phase_manager', 'cleanup_phase_manager', 'TutoringPhases', 'PhaseManager'),
+    'arduino_controller': ('get_arduino_controller', 'cleanup_arduino_controller', 'ArduinoController'),
+    'button_config': ('get_button_manager', 'cleanup_button_manager', 'EnhancedButtonManager'),
+    'pins_config': ('BUTTON_PINS', 'KNOB_PINS', 'LED_PINS', 'validate_pin_configuration'),
+}
 
-def test_pin_configuration():
+@pytest.mark.parametrize("module, name", [
+    (module, name) for module, names in EXPECTED_EXPORTS.items() for name in names
+])
+def test_imports(mocked_modules, module, name):
+    """Test that each required module provides its names"""
+    assert hasattr(getattr(mocked_modules, module), name), f"Missing {module}.{name}"
+
+def test_pin_configuration(mocked_modules, verbose):
     """Test pin configuration validation"""
-    print("\nTesting pin configuration...")
+    pins_config = mocked_modules.pins_config
+    
+    if verbose:
+        print(f"Button pins: {dict(pins_config.BUTTON_PINS)}")
+        print(f"Knob pins: {dict(pins_config.KNOB_PINS)}")
     
-    try:
-        from pins_config import validate_pin_configuration, BUTTON_PINS, KNOB_PINS
-        
-        print(f"Button pins: {BUTTON_PINS}")
-        print(f"Knob pins: {KNOB_PINS}")
-        
-        # Validate pin configuration
-        is_valid = validate_pin_configuration()
-        if is_valid:
-            print("✓ Pin configuration is valid")
-        else:
-            print("✗ Pin configuration has conflicts")
-        
-        return is_valid
-        
-    except Exception as e:
-        print(f"✗ Pin configuration test failed: {e}")
-        return False
+    # Validated once per session; test_components shares the cached result
+    assert pins_config.validate_pin_configuration(), "Pin configuration has conflicts"
 
-def test_tts_system():
+@pytest.mark.parametrize("method, args, expected", TTS_PROMPTS)
+def test_tts_system(tutor, method, args, expected):
     """Test TTS system functionality"""
-    print("\nTesting TTS system...")
-    
-    try:
-        from gtts_config import get_braille_tts
-        
-        # Test TTS initialization
-        tts = get_braille_tts()
-        print("✓ TTS system initialized")
-        
-        # Test basic TTS functions
-        print("Testing TTS methods...")
-        tts.welcome()
-        time.sleep(0.5)
-        
-        tts.speak("Test message sa TTS system")
-        time.sleep(0.5)
-        
-        tts.registered()
-        time.sleep(0.5)
-        
-        tts.erased()
-        time.sleep(0.5)
-        
-        tts.reading_pattern("Sample pattern")
-        time.sleep(0.5)
-        
-        tts.displaying_pattern("Sample display")
-        time.sleep(0.5)
-        
-        print("✓ TTS methods tested successfully")
-        return True
-        
-    except Exception as e:
-        print(f"✗ TTS system test failed: {e}")
-        return False
+    # The silent test TTS manager records each utterance; a real backend
+    # (BWT_TTS_BACKEND=gtts) has nothing to compare against
+    spoken = getattr(tutor.tts.tts, 'spoken', None)
+    if spoken is None:
+        pytest.skip("needs the silent TTS manager (BWT_TTS_BACKEND=null)")
+    future = getattr(tutor.tts, method)(*args)
+    future.result(timeout=1)
+    assert spoken[-1] == expected, spoken[-1:]
 
-def test_phase_manager():
+def test_phase_manager(mocked_modules, tutor):
     """Test phase manager functionality"""
-    print("\nTesting phase manager...")
-    
-    try:
-        from phase_manager import get_phase_manager, TutoringPhases
-        
-        # Test phase manager initialization
-        phase_manager = get_phase_manager()
-        print("✓ Phase manager initialized")
-        
-        # Test phase transitions
-        print("Testing phase transitions...")
-        
-        initial_phase = phase_manager.get_current_phase()
-        print(f"Initial phase: {initial_phase}")
-        
-        # Test each phase
-        for phase in [TutoringPhases.EMBOSSING, TutoringPhases.CHARACTER_ID, 
-                     TutoringPhases.MORPHOLOGY, TutoringPhases.SENTENCE,
-                     TutoringPhases.GAMIFICATION, TutoringPhases.FREEHAND,
-                     TutoringPhases.OFF]:
-            
-            print(f"Setting phase to: {phase}")
-            phase_manager.set_phase(phase)
-            current_phase = phase_manager.get_current_phase()
-            
-            if current_phase == phase:
-                print(f"✓ Phase {phase} set successfully")
-            else:
-                print(f"✗ Phase setting failed: expected {phase}, got {current_phase}")
-                return False
-            
-            time.sleep(0.5)
-        
-        # Test button handlers
-        print("Testing button handlers...")
-        phase_manager.set_phase(TutoringPhases.EMBOSSING)
-        
-        phase_manager.handle_register_button()
-        time.sleep(0.2)
-        
-        phase_manager.handle_read_button()
-        time.sleep(0.2)
-        
-        phase_manager.handle_display_button()
-        time.sleep(0.2)
-        
-        phase_manager.handle_erase_button()
-        time.sleep(0.2)
-        
-        print("✓ Button handlers tested successfully")
-        
-        # Return to OFF phase
-        phase_manager.set_phase(TutoringPhases.OFF)
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ Phase manager test failed: {e}")
-        return False
+    TutoringPhases = mocked_modules.phase_manager.TutoringPhases
+    
+    # Shared phase manager singleton
+    phase_manager = tutor.phase_manager
+    
+    # Test phase transitions: every phase in one pass, then one comparison
+    phases = [TutoringPhases.EMBOSSING, TutoringPhases.CHARACTER_ID,
+              TutoringPhases.MORPHOLOGY, TutoringPhases.SENTENCE,
+              TutoringPhases.GAMIFICATION, TutoringPhases.FREEHAND,
+              TutoringPhases.OFF]
+    result = [phase_manager.set_phase(phase) or phase_manager.get_current_phase()
+              for phase in phases]
+    assert result == phases, f"expected {phases}, got {result}"
+    
+    # Test button handlers back to back against the recorded speech
+    phase_manager.set_phase(TutoringPhases.EMBOSSING)
+    speak = phase_manager.tts.speak
+    speak.reset_mock()
+    phase_manager.input_handled.clear()
+    
+    phase_manager.handle_register_button()
+    phase_manager.handle_read_button()
+    phase_manager.handle_display_button()
+    phase_manager.handle_erase_button()
+    
+    spoken = [call.args[0] for call in speak.call_args_list]
+    assert spoken == [
+        "Na-register ang pattern. Tama ito.",
+        "Ang kasalukuyang pattern ay para sa pag-practice ng mga tuldok.",
+        "Ipapakita sa mechanical display.",
+        "Na-erase ang input.",
+    ], spoken
+    # Handlers ran inline, so completion is already signalled
+    assert phase_manager.input_handled.is_set()
+    
+    # Return to OFF phase
+    phase_manager.set_phase(TutoringPhases.OFF)
 
-def test_arduino_controller():
+def test_arduino_controller(mocked_modules, mock_serial):
     """Test Arduino controller functionality"""
-    print("\nTesting Arduino controller...")
+    arduino = mocked_modules.arduino_controller.ArduinoController(port='/dev/ttyMOCK')
+    assert arduino.connect()
     
-    try:
-        from arduino_controller import get_arduino_controller
-        
-        # Test Arduino controller initialization
-        arduino = get_arduino_controller()
-        print("✓ Arduino controller initialized")
-        
-        # Test command methods (won't actually send if not connected)
-        print("Testing Arduino command methods...")
-        
+    # All seven commands leave in one serial write
+    with arduino.batch():
         arduino.set_phase(1)
         arduino.display_text("TEST")
-        arduino.mirror_text("MIRROR")
+        arduino.display_mirrored_text("MIRROR")
         arduino.clear_display()
         arduino.enable_display()
         arduino.disable_display()
-        arduino.test_display()
-        
-        print("✓ Arduino command methods tested")
-        
-        # Test connection status
-        is_connected = arduino.is_connected()
-        print(f"Arduino connection status: {is_connected}")
-        
-        if not is_connected:
-            print("Note: Arduino not physically connected - this is expected in test environment")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ Arduino controller test failed: {e}")
-        return False
-
-def test_button_manager():
-    """Test button manager functionality (without GPIO)"""
-    print("\nTesting button manager...")
+        arduino.run_test()
     
-    try:
-        # Note: This will fail on non-Raspberry Pi systems due to GPIO import
-        # But we can test the import and basic structure
-        
-        print("Testing button manager import...")
-        from button_config import EnhancedButtonManager
-        print("✓ Button manager class imported")
-        
-        # We can't fully test GPIO functionality without actual hardware
-        print("Note: Full GPIO testing requires Raspberry Pi hardware")
-        
-        return True
-        
-    except Exception as e:
-        print(f"Note: Button manager test limited due to GPIO requirements: {e}")
-        return True  # Return True since this is expected without GPIO hardware
-
-def test_main_application():
-    """Test main application structure"""
-    print("\nTesting main application...")
+    payload = b"PHASE:1\nDISPLAY:TEST\nMIRROR:MIRROR\nCLEAR\nENABLE\nDISABLE\nTEST\n"
+    assert mock_serial.wait_for_write(payload)
+    writes = [call for call in mock_serial.calls if call[0] == "write"]
+    assert writes == [("write", payload)], writes
     
-    try:
-        # Import main application
-        import main
-        print("✓ Main application imported successfully")
-        
-        # Test BrailleWritingTutor class structure
-        tutor_class = main.BrailleWritingTutor
-        print("✓ BrailleWritingTutor class accessible")
-        
-        # Test that main function exists
-        main_func = main.main
-        print("✓ Main function accessible")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ Main application test failed: {e}")
-        return False
+    # Connected and a heartbeat was just seen
+    assert arduino.is_connected()
+    arduino.disconnect()
+    assert not arduino.is_connected()
 
-def run_comprehensive_test():
-    """Run all tests and provide summary"""
-    print("="*60)
-    print("       BRAILLE WRITING TUTOR - COMPREHENSIVE TEST")
-    print("="*60)
-    
-    tests = [
-        ("Module Imports", test_imports),
-        ("Pin Configuration", test_pin_configuration),
-        ("TTS System", test_tts_system),
-        ("Phase Manager", test_phase_manager),
-        ("Arduino Controller", test_arduino_controller),
-        ("Button Manager", test_button_manager),
-        ("Main Application", test_main_application)
-    ]
-    
-    results = []
-    
-    for test_name, test_func in tests:
-        print(f"\n{'='*20} {test_name} {'='*20}")
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"✗ {test_name} failed with exception: {e}")
-            results.append((test_name, False))
-    
-    # Print summary
-    print("\n" + "="*60)
-    print("                    TEST SUMMARY")
-    print("="*60)
-    
-    passed = 0
-    total = len(results)
-    
-    for test_name, result in results:
-        status = "✓ PASS" if result else "✗ FAIL"
-        print(f"{test_name:<20} : {status}")
-        if result:
-            passed += 1
-    
-    print("-"*60)
-    print(f"TOTAL: {passed}/{total} tests passed ({(passed/total)*100:.1f}%)")
-    
-    if passed == total:
-        print("🎉 ALL TESTS PASSED! System ready for deployment.")
-    else:
-        print("⚠️  Some tests failed. Please review the issues above.")
-    
-    # Cleanup
-    try:
-        from gtts_config import cleanup_tts
-        from phase_manager import cleanup_phase_manager
-        from arduino_controller import cleanup_arduino_controller
-        from button_config import cleanup_button_manager
-        
-        cleanup_tts()
-        cleanup_phase_manager()
-        cleanup_arduino_controller()
-        cleanup_button_manager()
-        
-        print("\n✓ Cleanup completed")
-    except Exception as e:
-        print(f"\n⚠️ Cleanup error: {e}")
-    
-    return passed == total
+def test_button_manager(mocked_modules):
+    """Test button manager functionality (without GPIO)"""
+    # pigpio is stubbed, so only the structure can be checked here;
+    # full GPIO testing requires Raspberry Pi hardware
+    assert hasattr(mocked_modules.button_config, 'EnhancedButtonManager')
+
+def test_singletons(mocked_modules, tutor):
+    """Test that the get_* accessors hand back the shared instances"""
+    m = mocked_modules
+    assert m.gtts_config.get_braille_tts() is tutor.tts
+    assert m.arduino_controller.get_arduino_controller() is tutor.arduino
+    assert m.phase_manager.get_phase_manager() is tutor.phase_manager
 
-if __name__ == "__main__":
-    success = run_comprehensive_test()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+def test_main_application(mocked_modules):
+    """Test main application structure"""
+    # Imported once for the session by the mocked_modules fixture;
+    # main.py only starts the tutor under __main__, so this binds
+    # definitions without touching hardware
+    main = mocked_modules.main
+    assert hasattr(main, "BrailleWritingTutor") and hasattr(main, "main")
@@ -5,9 +5,17 @@ This script demonstrates the text-to-speech functionality without requiring GPIO
 """
 
 import sys
-import time
 from gtts_config import get_tts_manager, get_braille_tts
 
+# Longest any single prompt may take to play
+SPEECH_TIMEOUT = 10
+
+def _check_spoken(tts_manager, expected):
+    """Under pytest the silent manager records speech; compare the latest lines"""
+    spoken = getattr(tts_manager, 'spoken', None)
+    if spoken is not None:
+        assert spoken[-len(expected):] == expected, spoken
+
 def test_basic_tts():
     """Test basic TTS functionality"""
     print("Testing basic TTS functionality...")
@@ -18,13 +26,11 @@ def test_basic_tts():
     print("Speaking: Hello World")
     tts_manager.speak("Hello World", blocking=True)
     
-    time.sleep(1)
-    
-    # Test non-blocking speech
+    # Test non-blocking speech, waiting on the returned future
     print("Speaking (non-blocking): This is a test")
-    tts_manager.speak("This is a test", blocking=False)
+    tts_manager.speak("This is a test").result(timeout=SPEECH_TIMEOUT)
     
-    time.sleep(3)  # Wait for speech to complete
+    _check_spoken(tts_manager, ["Hello World", "This is a test"])
     
 def test_braille_tts():
     """Test Braille-specific TTS messages"""
@@ -34,22 +40,22 @@ def test_braille_tts():
     
     # Test welcome message
     print("Playing welcome message...")
-    braille_tts.welcome()
-    time.sleep(3)
+    braille_tts.welcome().result(timeout=SPEECH_TIMEOUT)
     
     # Test button feedback
     print("Testing button feedback...")
-    braille_tts.button_registered()
-    time.sleep(2)
-    
-    braille_tts.pattern_erased()
-    time.sleep(2)
-    
-    braille_tts.reading_pattern("Letter A")
-    time.sleep(3)
-    
-    braille_tts.displaying_pattern()
-    time.sleep(2)
+    braille_tts.button_registered().result(timeout=SPEECH_TIMEOUT)
+    braille_tts.pattern_erased().result(timeout=SPEECH_TIMEOUT)
+    braille_tts.reading_pattern("Letter A").result(timeout=SPEECH_TIMEOUT)
+    braille_tts.displaying_pattern().result(timeout=SPEECH_TIMEOUT)
+    
+    _check_spoken(braille_tts.tts, [
+        "Welcome to Braille Writing Tutor. Press any button to begin.",
+        "Pattern registered successfully.",
+        "Pattern erased.",
+        "Reading pattern: Letter A",
+        "Displaying current pattern.",
+    ])
     
 def test_error_handling():
     """Test error handling and fallback"""
@@ -61,8 +67,9 @@ def test_error_handling():
     braille_tts.tts.speak("")
     
     # Test error message
-    braille_tts.error_message("Test error message")
-    time.sleep(3)
+    braille_tts.error_message("Test error message").result(timeout=SPEECH_TIMEOUT)
+    
+    _check_spoken(braille_tts.tts, ["Error: Test error message"])
 
 def main():
     """Main test function"""
@@ -76,8 +83,7 @@ def main():
         
         print("\nPlaying shutdown message...")
         braille_tts = get_braille_tts()
-        braille_tts.shutdown_message()
-        time.sleep(3)
+        braille_tts.shutdown_message().result(timeout=SPEECH_TIMEOUT)
         
         print("\nAll tests completed successfully!")
         